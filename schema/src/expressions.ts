@@ -133,10 +133,19 @@ export interface NullCheckExpression {
 export interface StringJoinExpression {
   /** The type of operation, always 'str_join'. */
   type: 'str_join';
-  /** An array of expressions whose string representations will be joined. */
+  /**
+   * An array of expressions whose string representations will be joined.
+   * A single operand of list type has its elements joined instead: null
+   * elements are treated like null operands, and a null list gives null.
+   */
   operands: Expression[];
   /** An optional delimiter string to insert between joined elements. */
   delimiter?: string;
+  /**
+   * If true, null operands are skipped instead of making the whole result null.
+   * Defaults to false.
+   */
+  ignoreNulls?: boolean;
 }
 
 /** Defines the supported hash types. Includes common cryptographic and non-cryptographic algorithms. */
@@ -209,15 +218,15 @@ export interface RankExpression {
 /**
  * Represents a cumulative sum function applied over a dataset partition.
  * Calculates the cumulative sum of the 'value' expression within each partition,
- * based on the specified ordering. Values are sorted by value and then by
- * additional_order_by before summing.
+ * based on the specified ordering. Rows are accumulated in additional_order_by
+ * order (in row order if it is empty); results keep the original row positions.
  */
 export interface CumsumExpression {
   /** The type of operation, always 'cumsum'. */
   type: 'cumsum';
   /** The expression whose values will be cumulatively summed. */
   value: Expression;
-  /** Defines additional ordering within partitions for the cumulative sum calculation, in addition to the ordering of the values themselves. */
+  /** Defines the order within partitions in which values are accumulated. */
   additionalOrderBy: Expression[];
   /** List of expressions to partition the data by before calculating the cumulative sum. The output of these expressions will be used for partitioning. */
   partitionBy: Expression[];
@@ -234,6 +243,11 @@ export interface ExtendedUnaryStringExpression {
   type: UnaryStringOperator | 'str_len';
   /** The string expression to operate on. */
   value: Expression;
+  /**
+   * Only for 'str_len'. If true, returns the length in bytes instead of characters.
+   * Both are the same for ASCII data, and the byte length is cheaper to compute.
+   */
+  byteLength?: boolean;
 }
 
 /** Defines the supported string distance metrics. */
@@ -75,6 +75,11 @@ export interface BaseFileWriteStep {
   file: string;
   /** Optional: A list of column names to write to the file. If omitted, all columns are written. */
   columns?: string[];
+  /**
+   * Optional: Whether rows are written in the table's order. Set to false to let
+   * the writer emit rows in any order, which allows a parallel sink. Defaults to true.
+   */
+  maintainOrder?: boolean;
 }
 
 /**
@@ -85,6 +90,8 @@ export interface WriteCsvStep extends BaseFileWriteStep {
   type: 'write_csv';
   /** Optional: The delimiter character to use in the output CSV file. */
   delimiter?: string;
+  /** Optional: The number of rows formatted per write batch. */
+  batchSize?: number;
 }
 
 // Not yet supported, should be a normal write_json, but we don't have a lazy sink_json, can create a workaround
@@ -55,7 +55,7 @@ def main():
     try:
         file_extension = workflow_file_path.suffix.lower()
         if file_extension == ".json":
-            ptw = msgspec.json.decode(workflow_content, type=PWorkflow)
+            ptw = PWorkflow.from_json(workflow_content)
         elif file_extension in [".yaml", ".yml"]:
             ptw = msgspec.yaml.decode(workflow_content, type=PWorkflow)
         else:
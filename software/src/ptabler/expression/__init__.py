@@ -1,178 +1,241 @@
+import importlib
+import os
+import sys
 import typing
-from .base import Expression
-
-from . import basics
-from . import string
-from . import fuzzy
-from . import conditional
-from . import window
-from . import hash
-from . import struct
-
-from .basics import (
-    GtExpression, GeExpression, EqExpression, LtExpression, LeExpression, NeqExpression, PlusExpression,
-    MinusExpression, MultiplyExpression, TrueDivExpression, FloorDivExpression, IsNaExpression, IsNotNaExpression,
-    Log10Expression, LogExpression, Log2Expression, AbsExpression, SqrtExpression, UnaryMinusExpression,
-    FloorExpression, RoundExpression, CeilExpression, CastExpression,
-    OrExpression, NotExpression, ColumnReferenceExpression, ConstantValueExpression, MinExpression, MaxExpression,
-    AndExpression,
-)
-from .string import (
-    StringJoinExpression, ToUpperExpression, ToLowerExpression, StrLenExpression, SubstringExpression,
-    StringReplaceExpression, StringContainsExpression, StringContainsAnyExpression, StringCountMatchesExpression,
-    StringExtractExpression, StringStartsWithExpression, StringEndsWithExpression,
-)
-from .fuzzy import (
-    StringDistanceExpression, FuzzyStringFilterExpression,
-)
-from .conditional import (
-    WhenThenClause, WhenThenOtherwiseExpression, FillNaExpression
-)
-from .window import (
-    RankExpression, CumsumExpression, WindowExpression
-)
-from .hash import (
-    HashExpression,
-)
-from .struct import (
-    StructFieldExpression,
-)
-
-# Define a Union type that includes all concrete expression types
-AnyExpression = typing.Union[
-    # Basic Comparisons
-    GtExpression,
-    GeExpression,
-    EqExpression,
-    LtExpression,
-    LeExpression,
-    NeqExpression,
-    # Basic Binary Arithmetic
-    PlusExpression,
-    MinusExpression,
-    MultiplyExpression,
-    TrueDivExpression,
-    FloorDivExpression,
-    # Basic Unary Arithmetic
-    Log10Expression,
-    LogExpression,
-    Log2Expression,
-    AbsExpression,
-    SqrtExpression,
-    UnaryMinusExpression,
-    FloorExpression,
-    RoundExpression,
-    CeilExpression,
-    CastExpression,
-    # Boolean Logic
-    AndExpression,
-    OrExpression,
-    NotExpression,
-    # Null Checks
-    IsNaExpression,
-    IsNotNaExpression,
-    # Core Types
-    ColumnReferenceExpression,
-    ConstantValueExpression,
-    # Min/Max
-    MinExpression,
-    MaxExpression,
-    # String Operations
-    StringJoinExpression,
-    ToUpperExpression,
-    ToLowerExpression,
-    StrLenExpression,
-    SubstringExpression,
-    StringReplaceExpression,
-    StringContainsExpression,
-    StringContainsAnyExpression,
-    StringCountMatchesExpression,
-    StringExtractExpression,
-    StringStartsWithExpression,
-    StringEndsWithExpression,
-    # Fuzzy String Operations
-    StringDistanceExpression,
-    FuzzyStringFilterExpression,
-    # Conditional Logic
-    WhenThenOtherwiseExpression,
-    FillNaExpression,
-    # Window Functions
-    RankExpression,
-    CumsumExpression,
-    WindowExpression,
-    # Hash Functions
-    HashExpression,
-    # String Distance Functions
-    StringDistanceExpression,
-    FuzzyStringFilterExpression,
-    # Struct Operations
-    StructFieldExpression,
-]
 
-basics.AnyExpression = AnyExpression
-string.AnyExpression = AnyExpression
-fuzzy.AnyExpression = AnyExpression
-conditional.AnyExpression = AnyExpression
-window.AnyExpression = AnyExpression
-hash.AnyExpression = AnyExpression
-struct.AnyExpression = AnyExpression
+from .base import Expression, planning_context
+
+# Concrete expression classes are resolved on first access (PEP 562), so that
+# importing this package (e.g. for Expression or planning_context) does not
+# pull in polars_hash, polars_ds, etc. until an expression class is used.
+_LAZY_EXPORTS: dict[str, str] = {
+    # Basics
+    "GtExpression": "basics",
+    "GeExpression": "basics",
+    "EqExpression": "basics",
+    "LtExpression": "basics",
+    "LeExpression": "basics",
+    "NeqExpression": "basics",
+    "PlusExpression": "basics",
+    "MinusExpression": "basics",
+    "MultiplyExpression": "basics",
+    "TrueDivExpression": "basics",
+    "FloorDivExpression": "basics",
+    "IsNaExpression": "basics",
+    "IsNotNaExpression": "basics",
+    "Log10Expression": "basics",
+    "LogExpression": "basics",
+    "Log2Expression": "basics",
+    "AbsExpression": "basics",
+    "SqrtExpression": "basics",
+    "UnaryMinusExpression": "basics",
+    "FloorExpression": "basics",
+    "RoundExpression": "basics",
+    "CeilExpression": "basics",
+    "CastExpression": "basics",
+    "AndExpression": "basics",
+    "OrExpression": "basics",
+    "NotExpression": "basics",
+    "ColumnReferenceExpression": "basics",
+    "ConstantValueExpression": "basics",
+    "MinExpression": "basics",
+    "MaxExpression": "basics",
+    # String
+    "StringJoinExpression": "string",
+    "ToUpperExpression": "string",
+    "ToLowerExpression": "string",
+    "StrLenExpression": "string",
+    "SubstringExpression": "string",
+    "StringReplaceExpression": "string",
+    "StringContainsExpression": "string",
+    "StringContainsAnyExpression": "string",
+    "StringCountMatchesExpression": "string",
+    "StringExtractExpression": "string",
+    "StringStartsWithExpression": "string",
+    "StringEndsWithExpression": "string",
+    # Fuzzy
+    "StringDistanceExpression": "fuzzy",
+    "FuzzyStringFilterExpression": "fuzzy",
+    # Conditional
+    "WhenThenClause": "conditional",
+    "WhenThenOtherwiseExpression": "conditional",
+    "FillNaExpression": "conditional",
+    # Window
+    "RankExpression": "window",
+    "CumsumExpression": "window",
+    "WindowExpression": "window",
+    # Hash
+    "HashExpression": "hash",
+    # Struct
+    "StructFieldExpression": "struct",
+}
+
+_SUBMODULES = ("basics", "string", "fuzzy", "conditional", "window", "hash", "struct")
+
+
+def _build_any_expression():
+    """
+    Builds the Union of all concrete expression types and injects it into the
+    submodules, where it is referenced by forward references ('AnyExpression')
+    that msgspec resolves against the module globals.
+    """
+    _get = _resolve_export
+
+    any_expression = typing.Union[
+        # Basic Comparisons
+        _get("GtExpression"),
+        _get("GeExpression"),
+        _get("EqExpression"),
+        _get("LtExpression"),
+        _get("LeExpression"),
+        _get("NeqExpression"),
+        # Basic Binary Arithmetic
+        _get("PlusExpression"),
+        _get("MinusExpression"),
+        _get("MultiplyExpression"),
+        _get("TrueDivExpression"),
+        _get("FloorDivExpression"),
+        # Basic Unary Arithmetic
+        _get("Log10Expression"),
+        _get("LogExpression"),
+        _get("Log2Expression"),
+        _get("AbsExpression"),
+        _get("SqrtExpression"),
+        _get("UnaryMinusExpression"),
+        _get("FloorExpression"),
+        _get("RoundExpression"),
+        _get("CeilExpression"),
+        _get("CastExpression"),
+        # Boolean Logic
+        _get("AndExpression"),
+        _get("OrExpression"),
+        _get("NotExpression"),
+        # Null Checks
+        _get("IsNaExpression"),
+        _get("IsNotNaExpression"),
+        # Core Types
+        _get("ColumnReferenceExpression"),
+        _get("ConstantValueExpression"),
+        # Min/Max
+        _get("MinExpression"),
+        _get("MaxExpression"),
+        # String Operations
+        _get("StringJoinExpression"),
+        _get("ToUpperExpression"),
+        _get("ToLowerExpression"),
+        _get("StrLenExpression"),
+        _get("SubstringExpression"),
+        _get("StringReplaceExpression"),
+        _get("StringContainsExpression"),
+        _get("StringContainsAnyExpression"),
+        _get("StringCountMatchesExpression"),
+        _get("StringExtractExpression"),
+        _get("StringStartsWithExpression"),
+        _get("StringEndsWithExpression"),
+        # Fuzzy String Operations
+        _get("StringDistanceExpression"),
+        _get("FuzzyStringFilterExpression"),
+        # Conditional Logic
+        _get("WhenThenOtherwiseExpression"),
+        _get("FillNaExpression"),
+        # Window Functions
+        _get("RankExpression"),
+        _get("CumsumExpression"),
+        _get("WindowExpression"),
+        # Hash Functions
+        _get("HashExpression"),
+        # Struct Operations
+        _get("StructFieldExpression"),
+    ]
+
+    # msgspec dispatches tagged unions through a tag -> type lookup, which
+    # requires every member to have its own tag.
+    classes_by_tag: dict[str, type] = {}
+    for member in typing.get_args(any_expression):
+        tag = member.__struct_config__.tag
+        if tag in classes_by_tag:
+            raise TypeError(
+                f"Expression tag '{tag}' is used by both "
+                f"{classes_by_tag[tag].__name__} and {member.__name__}")
+        classes_by_tag[tag] = member
+
+    for submodule_name in _SUBMODULES:
+        submodule = importlib.import_module(f".{submodule_name}", __name__)
+        submodule.AnyExpression = any_expression
+
+    return any_expression
+
+
+_loaded_submodules: set[str] = set()
+_building_any_expression = False
+
+
+def _submodule_loaded(module_name: str) -> None:
+    """
+    Called at the end of each expression submodule. Once no expression
+    submodule is still being imported, AnyExpression is built and injected,
+    so that classes imported straight from a submodule decode nested
+    expressions too.
+    """
+    _loaded_submodules.add(module_name.rpartition(".")[2])
+    in_progress = any(
+        f"{__name__}.{name}" in sys.modules and name not in _loaded_submodules
+        for name in _SUBMODULES)
+    if not in_progress:
+        _ensure_any_expression()
+
+
+def _ensure_any_expression():
+    """Builds and injects AnyExpression on first use."""
+    global _building_any_expression
+    if "AnyExpression" not in globals() and not _building_any_expression:
+        # Building imports the remaining submodules, which report back here
+        _building_any_expression = True
+        try:
+            globals()["AnyExpression"] = _build_any_expression()
+        finally:
+            _building_any_expression = False
+    return globals().get("AnyExpression")
+
+
+def _resolve_export(name: str):
+    """Imports the submodule defining `name` and caches the class here."""
+    submodule = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+    value = getattr(submodule, name)
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name: str):
+    if name != "AnyExpression" and name not in _LAZY_EXPORTS:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+
+    # Any concrete class may be decoded on its own, and its fields refer to
+    # AnyExpression, so the union is injected before the first class is
+    # handed out rather than on first access to AnyExpression itself.
+    any_expression = _ensure_any_expression()
+    if name == "AnyExpression":
+        return any_expression
+    return globals().get(name) or _resolve_export(name)
+
+
+def __dir__():
+    return list(__all__)
 
 
 __all__ = [
     "Expression",
     "AnyExpression",
-    "GtExpression",
-    "GtExpression",
-    "GeExpression",
-    "EqExpression",
-    "LtExpression",
-    "LeExpression",
-    "NeqExpression",
-    "PlusExpression",
-    "MinusExpression",
-    "MultiplyExpression",
-    "TrueDivExpression",
-    "FloorDivExpression",
-    "Log10Expression",
-    "LogExpression",
-    "Log2Expression",
-    "AbsExpression",
-    "SqrtExpression",
-    "UnaryMinusExpression",
-    "FloorExpression",
-    "RoundExpression",
-    "CeilExpression",
-    "AndExpression",
-    "OrExpression",
-    "NotExpression",
-    "IsNaExpression",
-    "IsNotNaExpression",
-    "ColumnReferenceExpression",
-    "ConstantValueExpression",
-    "MinExpression",
-    "MaxExpression",
-    "StringJoinExpression",
-    "ToUpperExpression",
-    "ToLowerExpression",
-    "StrLenExpression",
-    "SubstringExpression",
-    "StringReplaceExpression",
-    "StringContainsExpression",
-    "StringContainsAnyExpression",
-    "StringCountMatchesExpression",
-    "StringExtractExpression",
-    "StringStartsWithExpression",
-    "StringEndsWithExpression",
-    "StringDistanceExpression",
-    "FuzzyStringFilterExpression",
-    "WhenThenClause",
-    "WhenThenOtherwiseExpression",
-    "FillNaExpression",
-    "RankExpression",
-    "CumsumExpression",
-    "WindowExpression",
-    "HashExpression",
-    "StringDistanceExpression",
-    "FuzzyStringFilterExpression",
-    "StructFieldExpression"
+    "planning_context",
+    *_LAZY_EXPORTS,
 ]
+
+if __debug__:
+    assert len(set(__all__)) == len(__all__), "Duplicate names in ptabler.expression.__all__"
+
+# Eagerly resolve everything (e.g. in CI) to surface import errors early.
+if os.environ.get("PTABLER_EAGER_IMPORT") == "1":
+    __getattr__("AnyExpression")
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
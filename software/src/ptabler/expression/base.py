@@ -1,13 +1,263 @@
+import contextlib
+import contextvars
+import hashlib
+import itertools
+import typing
+
 import msgspec
 import polars as pl
 
 
-class Expression(msgspec.Struct, tag_field="type", rename="camel"):
+class PlanningContext:
+    """
+    State shared by all expressions lowered for one step.
+
+    Holds the input frame (if any), whose schema lets expressions choose a
+    native Polars implementation at plan-build time, and a cache of rendered
+    Polars expressions keyed by structural key, so that structurally equal
+    subtrees are rendered once.
+    """
+    _serials = itertools.count(1)
+
+    def __init__(self, frame: typing.Optional[pl.LazyFrame] = None):
+        self.frame = frame
+        self.serial = next(PlanningContext._serials)
+        self.expressions: dict[bytes, pl.Expr] = {}
+        self._schema: typing.Optional[pl.Schema] = None
+
+    @property
+    def schema(self) -> typing.Optional[pl.Schema]:
+        """The schema of the input frame, resolved on first use."""
+        if self._schema is None and self.frame is not None:
+            self._schema = self.frame.collect_schema()
+        return self._schema
+
+    def resolve_dtype(self, expression: pl.Expr) -> typing.Optional[pl.DataType]:
+        """
+        Returns the data type the expression evaluates to on the input frame,
+        or None if there is no frame or the type cannot be resolved.
+        """
+        if self.frame is None:
+            return None
+        try:
+            return self.frame.select(expression.alias("_")).collect_schema()["_"]
+        except pl.exceptions.PolarsError:
+            return None
+
+
+NOT_CONSTANT: typing.Final = object()
+"""Returned by Expression.constant_value for expressions that depend on the data."""
+
+
+_planning_context: contextvars.ContextVar[typing.Optional[PlanningContext]] = \
+    contextvars.ContextVar("ptabler_planning_context", default=None)
+
+
+@contextlib.contextmanager
+def planning_context(frame: typing.Optional[pl.LazyFrame] = None):
+    """
+    Opens a planning context for lowering expressions against `frame`.
+
+    Within this context, structurally equal expressions (e.g. two separately
+    decoded `col("x") + 1` subtrees) are rendered to one shared Polars
+    expression instead of being rebuilt for every occurrence.
+    """
+    token = _planning_context.set(PlanningContext(frame))
+    try:
+        yield _planning_context.get()
+    finally:
+        _planning_context.reset(token)
+
+
+def current_planning_context() -> typing.Optional[PlanningContext]:
+    """Returns the active planning context, if any."""
+    return _planning_context.get()
+
+
+class Expression(msgspec.Struct, tag_field="type", rename="camel", frozen=True, dict=True):
     """
     Base class for all expressions in the pipeline.
+
+    Expression trees are immutable, so nodes are frozen. The instance
+    __dict__ only holds derived, non-serialized data (see to_polars and
+    structural_key).
     """
+    # Set by window functions, whose value for a row depends on other rows
+    _depends_on_other_rows: typing.ClassVar[bool] = False
+
     def to_polars(self) -> pl.Expr:
         """
         Renders the expression as a Polars expression.
+
+        The result is cached on the instance, so an expression node that is
+        referenced several times in a tree is only converted once. Rendering
+        may depend on the input schema, so the cached value is tied to the
+        planning context it was built in. Inside a planning context the result
+        is also shared between structurally equal nodes.
+        """
+        context = _planning_context.get()
+        serial = context.serial if context is not None else None
+        cached = self.__dict__.get("_polars_expr")
+        if cached is not None and cached[0] == serial:
+            return cached[1]
+
+        # Render the uncached part of the subtree children first, so each
+        # node finds its children cached and lowering never recurses: the
+        # depth of a tree is not limited by the interpreter stack.
+        def is_rendered(node: Expression) -> bool:
+            node_cached = node.__dict__.get("_polars_expr")
+            return node_cached is not None and node_cached[0] == serial
+
+        for node in _post_order(self, is_rendered):
+            if context is None:
+                result = node._to_polars_impl()
+            else:
+                key = node.structural_key()
+                result = context.expressions.get(key)
+                if result is None:
+                    result = node._to_polars_impl()
+                    context.expressions[key] = result
+            node.__dict__["_polars_expr"] = (serial, result)
+        return self.__dict__["_polars_expr"][1]
+
+    def _to_polars_impl(self) -> pl.Expr:
         """
-        pass
+        Builds the Polars expression for this node. Implemented by subclasses.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement _to_polars_impl")
+
+    def constant_value(self) -> typing.Any:
+        """
+        Returns the value this expression evaluates to if it does not depend
+        on the data (e.g. a string function applied to constants), so it can
+        be emitted as a single literal. Returns NOT_CONSTANT otherwise.
+
+        The result is cached on the instance, so folding a tree visits each
+        node once even though every node asks its children.
+        """
+        try:
+            return self.__dict__["_constant_value"]
+        except KeyError:
+            value = self._constant_value_impl()
+            self.__dict__["_constant_value"] = value
+            return value
+
+    def _constant_value_impl(self) -> typing.Any:
+        """
+        Computes constant_value for this node. Overridden by expressions that
+        can be evaluated without data.
+        """
+        return NOT_CONSTANT
+
+    def walk(self) -> typing.Iterator['Expression']:
+        """Yields this expression and all its subexpressions, depth first."""
+        stack: list[Expression] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            children = [
+                child
+                for field in node.__struct_fields__
+                for child in _child_expressions(getattr(node, field))
+            ]
+            stack.extend(reversed(children))
+
+    def column_references(self) -> frozenset[str]:
+        """Returns the names of all input columns the expression reads."""
+        names: set[str] = set()
+        for field in self.__struct_fields__:
+            for child in _child_expressions(getattr(self, field)):
+                names.update(child.column_references())
+        return frozenset(names)
+
+    def is_row_wise(self) -> bool:
+        """
+        Returns True if the value for each row depends only on that row, i.e.
+        the expression contains no window functions.
+        """
+        return not any(node._depends_on_other_rows for node in self.walk())
+
+    def structural_key(self) -> bytes:
+        """
+        Returns a key that is equal for structurally identical expressions:
+        a digest of the node type, its scalar fields and the keys of its
+        children. Keys are computed bottom-up and cached on each node, so
+        keying a tree costs one pass however deep it is.
+        """
+        key = self.__dict__.get("_structural_key")
+        if key is None:
+            for node in _post_order(self, lambda node: "_structural_key" in node.__dict__):
+                node.__dict__["_structural_key"] = _digest_node(node)
+            key = self.__dict__["_structural_key"]
+        return key
+
+    def compile(self) -> pl.Expr:
+        """
+        Renders the whole expression tree, sharing one Polars expression
+        between all structurally equal subtrees.
+        """
+        with planning_context():
+            return self.to_polars()
+
+
+def _child_expressions(value: typing.Any) -> typing.Iterator[Expression]:
+    """Yields the expressions held by a field value."""
+    if isinstance(value, Expression):
+        yield value
+    elif isinstance(value, msgspec.Struct):
+        # Non-expression nodes such as when/then clauses
+        for field in value.__struct_fields__:
+            yield from _child_expressions(getattr(value, field))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _child_expressions(item)
+
+
+def _post_order(
+    root: Expression, is_done: typing.Callable[[Expression], bool]
+) -> typing.Iterator[Expression]:
+    """
+    Yields the nodes of the tree under root children first, skipping subtrees
+    for which is_done returns True. Uses an explicit stack, so it works on
+    trees deeper than the interpreter recursion limit.
+    """
+    if is_done(root):
+        return
+    stack: list[tuple[Expression, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            # A node shared between branches may have been finished already
+            if not is_done(node):
+                yield node
+            continue
+        stack.append((node, True))
+        children = [
+            child
+            for field in node.__struct_fields__
+            for child in _child_expressions(getattr(node, field))
+        ]
+        for child in reversed(children):
+            if not is_done(child):
+                stack.append((child, False))
+
+
+def _key_part(value: typing.Any) -> typing.Any:
+    """Encodes a field value for _digest_node, using child keys for subtrees."""
+    if isinstance(value, Expression):
+        return ["e", value.__dict__["_structural_key"].hex()]
+    if isinstance(value, msgspec.Struct):
+        return ["s", type(value).__qualname__,
+                [_key_part(getattr(value, field)) for field in value.__struct_fields__]]
+    if isinstance(value, (list, tuple)):
+        return ["l", [_key_part(item) for item in value]]
+    return ["v", value]
+
+
+def _digest_node(node: Expression) -> bytes:
+    """Hashes one node, given that the keys of its children are cached."""
+    cls = type(node)
+    parts: list[typing.Any] = [f"{cls.__module__}.{cls.__qualname__}"]
+    parts.extend(_key_part(getattr(node, field)) for field in node.__struct_fields__)
+    return hashlib.blake2b(msgspec.json.encode(parts), digest_size=16).digest()
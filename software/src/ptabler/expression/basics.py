@@ -1,11 +1,11 @@
-from cmath import log
+import math
 import typing
 import operator
 import polars as pl
 
 from ptabler.common import PType, toPolarsType
 
-from .base import Expression
+from .base import NOT_CONSTANT, Expression
 
 # Comparison Expressions
 
@@ -16,62 +16,86 @@ class BinaryOperatorExpression(Expression):
     lhs: 'AnyExpression'
     rhs: 'AnyExpression'
 
+    # Python operator applied to the rendered operands, bound per subclass
+    _op: typing.ClassVar[typing.Callable[[pl.Expr, pl.Expr], pl.Expr]]
+
+    def _constant_value_impl(self) -> typing.Any:
+        lhs = self.lhs.constant_value()
+        rhs = self.rhs.constant_value()
+        # Only operands on which Python and Polars agree: two finite numbers
+        # or two strings. Nulls, bools and mixed kinds are left to Polars.
+        if not (_is_finite_number(lhs) and _is_finite_number(rhs)) \
+                and not (isinstance(lhs, str) and isinstance(rhs, str)):
+            return NOT_CONSTANT
+        try:
+            value = self._op(lhs, rhs)
+        except (ArithmeticError, TypeError):
+            # e.g. division by zero, which Polars evaluates to inf or null
+            return NOT_CONSTANT
+        if isinstance(value, int) and not isinstance(value, bool) \
+                and not -2**63 <= value < 2**63:
+            return NOT_CONSTANT
+        return value
+
+    def _to_polars_impl(self) -> pl.Expr:
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value)
+        return self._op(self.lhs.to_polars(), self.rhs.to_polars())
+
+
+def _is_finite_number(value: typing.Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, float) and math.isfinite(value)
+
 
 class GtExpression(BinaryOperatorExpression, tag='gt'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() > self.rhs.to_polars()
+    _op = staticmethod(operator.gt)
 
 
 class GeExpression(BinaryOperatorExpression, tag='ge'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() >= self.rhs.to_polars()
+    _op = staticmethod(operator.ge)
 
 
 class EqExpression(BinaryOperatorExpression, tag='eq'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() == self.rhs.to_polars()
+    _op = staticmethod(operator.eq)
 
 
 class LtExpression(BinaryOperatorExpression, tag='lt'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() < self.rhs.to_polars()
+    _op = staticmethod(operator.lt)
 
 
 class LeExpression(BinaryOperatorExpression, tag='le'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() <= self.rhs.to_polars()
+    _op = staticmethod(operator.le)
 
 
 class NeqExpression(BinaryOperatorExpression, tag='neq'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() != self.rhs.to_polars()
+    _op = staticmethod(operator.ne)
 
 
 # Binary Arithmetic Expressions
 
 class PlusExpression(BinaryOperatorExpression, tag='plus'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() + self.rhs.to_polars()
+    _op = staticmethod(operator.add)
 
 
 class MinusExpression(BinaryOperatorExpression, tag='minus'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() - self.rhs.to_polars()
+    _op = staticmethod(operator.sub)
 
 
 class MultiplyExpression(BinaryOperatorExpression, tag='multiply'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() * self.rhs.to_polars()
+    _op = staticmethod(operator.mul)
 
 
 class TrueDivExpression(BinaryOperatorExpression, tag='truediv'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() / self.rhs.to_polars()
+    _op = staticmethod(operator.truediv)
 
 
 class FloorDivExpression(BinaryOperatorExpression, tag='floordiv'):
-    def to_polars(self) -> pl.Expr:
-        return self.lhs.to_polars() // self.rhs.to_polars()
+    _op = staticmethod(operator.floordiv)
 
 
 # Unary Arithmetic Expressions
@@ -81,47 +105,47 @@ class UnaryArithmeticBaseExpression(Expression):
 
 
 class Log10Expression(UnaryArithmeticBaseExpression, tag='log10'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().log10()
 
 
 class LogExpression(UnaryArithmeticBaseExpression, tag='log'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().log()
 
 
 class Log2Expression(UnaryArithmeticBaseExpression, tag='log2'):
-    def to_polars(self) -> pl.Expr:
-        return self.value.to_polars().log() / pl.lit(log(2))
+    def _to_polars_impl(self) -> pl.Expr:
+        return self.value.to_polars().log(base=2)
 
 
 class AbsExpression(UnaryArithmeticBaseExpression, tag='abs'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().abs()
 
 
 class SqrtExpression(UnaryArithmeticBaseExpression, tag='sqrt'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().sqrt()
 
 
 class FloorExpression(UnaryArithmeticBaseExpression, tag='floor'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().floor()
 
 
 class RoundExpression(UnaryArithmeticBaseExpression, tag='round'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().round()
 
 
 class CeilExpression(UnaryArithmeticBaseExpression, tag='ceil'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().ceil()
 
 
 class UnaryMinusExpression(UnaryArithmeticBaseExpression, tag='negate'):
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return -self.value.to_polars()  # Unary minus operator
 
 # Type casting
@@ -132,41 +156,66 @@ class CastExpression(Expression, tag='cast'):
     dtype: PType
     strict: typing.Optional[bool] = None
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         return self.value.to_polars().cast(toPolarsType(self.dtype), strict=self.strict or False)
 
 # Boolean Logic Expressions
 
 
-class AndExpression(Expression, tag='and'):
+class VariadicOperatorExpression(Expression):
     operands: list['AnyExpression']
 
-    def to_polars(self) -> pl.Expr:
-        polars_operands = [op.to_polars() for op in self.operands]
-        if not polars_operands:
-            # Define behavior for empty operands: 'and' -> True
-            return pl.lit(True)
-        return pl.all_horizontal(polars_operands)
+    # Value for an empty operand list and the horizontal reduction applied to
+    # two or more operands, bound per subclass
+    _empty_value: typing.ClassVar[typing.Optional[bool]]
+    _reduce: typing.ClassVar[typing.Callable[[list[pl.Expr]], pl.Expr]]
 
+    def _flat_operands(self) -> list['AnyExpression']:
+        """Operands with nested operations of the same kind hoisted, e.g. and(a, and(b, c)) -> [a, b, c]."""
+        operands: list['AnyExpression'] = []
+        for op in self.operands:
+            if type(op) is type(self):
+                operands.extend(op._flat_operands())
+            else:
+                operands.append(op)
+        return operands
+
+    def _to_polars_impl(self) -> pl.Expr:
+        operands = self._flat_operands()
+        if not operands:
+            return pl.lit(self._empty_value)
+        if len(operands) == 1:
+            return operands[0].to_polars()
+        return self._reduce([op.to_polars() for op in operands])
+
+
+class AndExpression(VariadicOperatorExpression, tag='and'):
+    # Define behavior for empty operands: 'and' -> True
+    _empty_value = True
+    _reduce = staticmethod(pl.all_horizontal)
 
-class OrExpression(Expression, tag='or'):
-    operands: list['AnyExpression']
 
-    def to_polars(self) -> pl.Expr:
-        polars_operands = [op.to_polars() for op in self.operands]
-        if not polars_operands:
-            # Define behavior for empty operands: 'or' -> False
-            return pl.lit(False)
-        return pl.any_horizontal(polars_operands)
+class OrExpression(VariadicOperatorExpression, tag='or'):
+    # Define behavior for empty operands: 'or' -> False
+    _empty_value = False
+    _reduce = staticmethod(pl.any_horizontal)
 
 
 # Not Expression
 class NotExpression(Expression, tag='not'):
     value: 'AnyExpression'
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
+        value = self.value
+        # Simplify negations that have a direct Polars counterpart
+        if isinstance(value, NotExpression):
+            return value.value.to_polars()
+        if isinstance(value, IsNaExpression):
+            return value.value.to_polars().is_not_null()
+        if isinstance(value, IsNotNaExpression):
+            return value.value.to_polars().is_null()
         # Use bitwise NOT operator (~) which acts as logical NOT for boolean expressions in Polars
-        return ~self.value.to_polars()
+        return ~value.to_polars()
 
 
 # Null Check Expressions
@@ -174,14 +223,18 @@ class NotExpression(Expression, tag='not'):
 class IsNaExpression(Expression, tag='is_na'):
     value: 'AnyExpression'
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
+        if isinstance(self.value, ConstantValueExpression):
+            return pl.lit(self.value.value is None)
         return self.value.to_polars().is_null()
 
 
 class IsNotNaExpression(Expression, tag='is_not_na'):
     value: 'AnyExpression'
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
+        if isinstance(self.value, ConstantValueExpression):
+            return pl.lit(self.value.value is not None)
         return self.value.to_polars().is_not_null()
 
 
@@ -189,7 +242,10 @@ class IsNotNaExpression(Expression, tag='is_not_na'):
 class ColumnReferenceExpression(Expression, tag='col'):
     name: str
 
-    def to_polars(self) -> pl.Expr:
+    def column_references(self) -> frozenset[str]:
+        return frozenset((self.name,))
+
+    def _to_polars_impl(self) -> pl.Expr:
         return pl.col(self.name)
 
 
@@ -197,27 +253,25 @@ class ColumnReferenceExpression(Expression, tag='col'):
 class ConstantValueExpression(Expression, tag='const'):
     value: typing.Union[str, int, float, bool, None]
 
-    def to_polars(self) -> pl.Expr:
+    def _constant_value_impl(self) -> typing.Any:
+        return self.value
+
+    def _to_polars_impl(self) -> pl.Expr:
         return pl.lit(self.value)
 
 
 # Min/Max Expressions
 
-class MinExpression(Expression, tag='min'):
-    operands: list['AnyExpression']
+class MinExpression(VariadicOperatorExpression, tag='min'):
+    _empty_value = None
+    _reduce = staticmethod(pl.min_horizontal)
 
-    def to_polars(self) -> pl.Expr:
-        polars_operands = [op.to_polars() for op in self.operands]
-        if not polars_operands:
-            return pl.lit(None)
-        return pl.min_horizontal(polars_operands)
 
+class MaxExpression(VariadicOperatorExpression, tag='max'):
+    _empty_value = None
+    _reduce = staticmethod(pl.max_horizontal)
 
-class MaxExpression(Expression, tag='max'):
-    operands: list['AnyExpression']
 
-    def to_polars(self) -> pl.Expr:
-        polars_operands = [op.to_polars() for op in self.operands]
-        if not polars_operands:
-            return pl.lit(None)
-        return pl.max_horizontal(polars_operands)
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
@@ -2,7 +2,7 @@ import typing
 import msgspec
 import polars as pl
 
-from .base import Expression
+from .base import NOT_CONSTANT, Expression
 
 AnyExpression = Expression
 
@@ -27,16 +27,40 @@ class WhenThenOtherwiseExpression(Expression, tag='when_then_otherwise'):
     # : The expression whose value is returned if none of the "when" conditions are met.
     otherwise: 'AnyExpression'
 
-    def to_polars(self) -> pl.Expr:
+    def _reachable_clauses(self) -> tuple[list[WhenThenClause], 'AnyExpression']:
         """
-        Builds the Polars when/then/otherwise expression chain directly.
+        Returns the clauses that can be taken and the fallback expression.
+        Clauses with a constant false (or null) condition are dropped, and a
+        constant true condition ends the chain, its result becoming the fallback.
         """
-        if not self.conditions:
-            # If there are no conditions, just return the otherwise expression
-            return self.otherwise.to_polars()
+        clauses = []
+        for clause in self.conditions:
+            condition = clause.when.constant_value()
+            if condition is True:
+                return clauses, clause.then
+            if condition is False or condition is None:
+                continue
+            clauses.append(clause)
+        return clauses, self.otherwise
+
+    def _constant_value_impl(self) -> typing.Any:
+        clauses, fallback = self._reachable_clauses()
+        if clauses:
+            return NOT_CONSTANT
+        return fallback.constant_value()
+
+    def _to_polars_impl(self) -> pl.Expr:
+        """
+        Builds the Polars when/then/otherwise expression chain directly,
+        leaving out clauses that can never be taken.
+        """
+        clauses, fallback = self._reachable_clauses()
+        if not clauses:
+            # No condition left to evaluate, just return the fallback expression
+            return fallback.to_polars()
 
         # Start the chain with the first condition
-        first_clause = self.conditions[0]
+        first_clause = clauses[0]
         polars_expr = pl.when(
             first_clause.when.to_polars()
         ).then(
@@ -44,7 +68,7 @@ class WhenThenOtherwiseExpression(Expression, tag='when_then_otherwise'):
         )
 
         # Chain the remaining conditions
-        for condition_clause in self.conditions[1:]:
+        for condition_clause in clauses[1:]:
             polars_expr = polars_expr.when(
                 condition_clause.when.to_polars()
             ).then(
@@ -52,7 +76,7 @@ class WhenThenOtherwiseExpression(Expression, tag='when_then_otherwise'):
             )
 
         # Add the final otherwise clause
-        polars_expr = polars_expr.otherwise(self.otherwise.to_polars())
+        polars_expr = polars_expr.otherwise(fallback.to_polars())
 
         return polars_expr
 
@@ -67,8 +91,13 @@ class FillNaExpression(Expression, tag='fill_na'):
     input: 'AnyExpression'  # : The primary expression to evaluate.
     fill_value: 'AnyExpression'  # : The expression whose value is used if 'input' is null.
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """
         Converts the expression to a Polars expression using fill_null.
         """
         return self.input.to_polars().fill_null(self.fill_value.to_polars())
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
@@ -31,7 +31,7 @@ class StringDistanceExpression(Expression, tag='string_distance'):
     Jaro-Winkler always returns similarity.
     """
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars expression using polars-ds."""
         s1_polars = self.string1.to_polars()
         s2_polars = self.string2.to_polars()
@@ -74,7 +74,7 @@ class FuzzyStringFilterExpression(Expression, tag='fuzzy_string_filter'):
     bound: int
     """The maximum allowed distance for a match (inclusive). Must be non-negative."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars boolean expression using polars-ds."""
         if self.bound < 0:
             raise ValueError(
@@ -91,3 +91,8 @@ class FuzzyStringFilterExpression(Expression, tag='fuzzy_string_filter'):
             case _:
                 raise ValueError(
                     f"Unsupported fuzzy filter metric: {self.metric}")
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
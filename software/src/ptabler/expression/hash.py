@@ -1,6 +1,5 @@
 import typing
 import polars as pl
-import polars_hash
 import math
 
 from .base import Expression
@@ -27,8 +26,17 @@ HashEncoding = typing.Literal[
 
 _CRYPTOGRAPHIC_HASH_TYPES: set[HashType] = {
     'sha256', 'sha512', 'md5', 'blake3'}
-_NON_CRYPTOGRAPHIC_HASH_TYPES: set[HashType] = {
-    'wyhash', 'xxh3'
+
+# Maps each supported hash type to the polars-hash accessor call producing it.
+# Cryptographic hashes (.chash) return hex strings, non-cryptographic ones
+# (.nchash) return UInt64 values.
+_HASH_FUNCTIONS: dict[HashType, typing.Callable[[pl.Expr], pl.Expr]] = {
+    'sha256': lambda e: e.chash.sha2_256(),
+    'sha512': lambda e: e.chash.sha2_512(),
+    'md5': lambda e: e.chash.md5(),
+    'blake3': lambda e: e.chash.blake3(),
+    'wyhash': lambda e: e.nchash.wyhash(),
+    'xxh3': lambda e: e.nchash.xxh3_64bit(),  # Current API 'xxh3' implies 64-bit
 }
 
 _HASH_OUTPUT_BITS: dict[HashType, int] = {
@@ -71,7 +79,7 @@ class HashExpression(Expression, tag='hash'):
     for the chosen encoding will be used.
     """
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """
         Converts the hash expression definition into a Polars expression.
 
@@ -80,63 +88,54 @@ class HashExpression(Expression, tag='hash'):
         *before* truncation for relevant base64 encodings.
 
         Raises:
-            AttributeError: If the specified hash_type is not supported by the
-                            polars-hash library accessor.
             ValueError: If an unknown hash_type or encoding is encountered.
         """
 
-        if self.hash_type == 'sha256':
-            polars_hash_function_name = 'sha2_256'
-        elif self.hash_type == 'sha512':
-            polars_hash_function_name = 'sha2_512'
-        elif self.hash_type == 'xxh3':  # Current API 'xxh3' implies 64-bit
-            polars_hash_function_name = 'xxh3_64bit'
-        else:
-            # For 'md5', 'blake3', 'wyhash', the API name matches the polars-hash name
-            polars_hash_function_name = self.hash_type
+        hash_function = _HASH_FUNCTIONS.get(self.hash_type)
+        if hash_function is None:
+            raise ValueError(f"Unknown hash type: {self.hash_type}")
+
+        # Importing polars_hash registers the .chash/.nchash expression
+        # namespaces; deferred so that workflows without hashing skip loading it.
+        import polars_hash  # noqa: F401
 
         polars_value = self.value.to_polars()
         max_bits_for_hash = _HASH_OUTPUT_BITS[self.hash_type]
 
+        # Step 1: Compute the hash. Cryptographic hashes come back hex encoded,
+        # non-cryptographic ones as UInt64. Casting a UInt64 to Binary gives
+        # the bytes of its decimal text (not its 8-byte value); encodings are
+        # applied to those bytes, which existing hash outputs depend on.
         if self.hash_type in _CRYPTOGRAPHIC_HASH_TYPES:
-            try:
-                hasher = getattr(polars_value.chash, polars_hash_function_name)
-            except AttributeError as e:
-                raise AttributeError(
-                    f"Cryptographic hash type '{self.hash_type}' (mapped to '{polars_hash_function_name}') not supported by polars-hash .chash accessor."
-                ) from e
-            base_hash_expr_hex = hasher()
-        elif self.hash_type in _NON_CRYPTOGRAPHIC_HASH_TYPES:
-            try:
-                hasher = getattr(polars_value.nchash, polars_hash_function_name)
-            except AttributeError as e:
-                raise AttributeError(
-                    f"Non-cryptographic hash type '{self.hash_type}' (mapped to '{polars_hash_function_name}') not supported by polars-hash .nchash accessor."
-                ) from e
-            u64_hash_expr = hasher()
-            # Convert U64 to a full 16-character hex string (64 bits)
-            base_hash_expr_hex = u64_hash_expr.cast(pl.Binary).bin.encode('hex')
+            base_hash_expr_hex = hash_function(polars_value)
+            base_hash_expr_bin = None
         else:
-            raise ValueError(f"Unknown hash type: {self.hash_type}")
+            base_hash_expr_hex = None
+            base_hash_expr_bin = hash_function(polars_value).cast(pl.Binary)
 
         # Step 2: Convert to target encoding and apply transformations (filtering/uppercasing)
         # The effective_bits_per_char is for the encoding *before* filtering, used for truncation length.
         if self.encoding == 'hex':
+            if base_hash_expr_hex is None:
+                # Hex of the decimal digits, up to 40 characters
+                base_hash_expr_hex = base_hash_expr_bin.bin.encode('hex')
             working_expr = base_hash_expr_hex
             effective_bits_per_char_for_trunc = 4
-        elif self.encoding == 'base64':
-            working_expr = base_hash_expr_hex.str.decode('hex').bin.encode('base64')
-            effective_bits_per_char_for_trunc = 6
-        elif self.encoding == 'base64_alphanumeric':
-            b64_expr = base_hash_expr_hex.str.decode('hex').bin.encode('base64')
-            # Remove non-alphanumeric characters (e.g., '+', '/', '=')
-            working_expr = b64_expr.str.replace_all(r"[^a-zA-Z0-9]", "", literal=False)
-            effective_bits_per_char_for_trunc = 5.95 # accounting for absent + and / characters
-        elif self.encoding == 'base64_alphanumeric_upper':
-            b64_expr = base_hash_expr_hex.str.decode('hex').bin.encode('base64')
-            filtered_expr = b64_expr.str.replace_all(r"[^a-zA-Z0-9]", "", literal=False)
-            working_expr = filtered_expr.str.to_uppercase()
-            effective_bits_per_char_for_trunc = 5.11 # also accounting for uneven probability between digits and letters
+        elif self.encoding in ('base64', 'base64_alphanumeric', 'base64_alphanumeric_upper'):
+            if base_hash_expr_bin is None:
+                base_hash_expr_bin = base_hash_expr_hex.str.decode('hex')
+            b64_expr = base_hash_expr_bin.bin.encode('base64')
+            if self.encoding == 'base64':
+                working_expr = b64_expr
+                effective_bits_per_char_for_trunc = 6
+            elif self.encoding == 'base64_alphanumeric':
+                # Remove non-alphanumeric characters (e.g., '+', '/', '=')
+                working_expr = b64_expr.str.replace_all(r"[^a-zA-Z0-9]", "", literal=False)
+                effective_bits_per_char_for_trunc = 5.95 # accounting for absent + and / characters
+            else:
+                filtered_expr = b64_expr.str.replace_all(r"[^a-zA-Z0-9]", "", literal=False)
+                working_expr = filtered_expr.str.to_uppercase()
+                effective_bits_per_char_for_trunc = 5.11 # also accounting for uneven probability between digits and letters
         else:
             raise ValueError(f"Unsupported encoding: {self.encoding}")
 
@@ -146,3 +145,8 @@ class HashExpression(Expression, tag='hash'):
             working_expr = working_expr.str.slice(offset=0, length=trunc_len)
             
         return working_expr
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
@@ -1,7 +1,8 @@
 import typing
 import polars as pl
 
-from .base import Expression
+from .base import Expression, NOT_CONSTANT, current_planning_context
+from .basics import ConstantValueExpression
 
 AnyExpression = Expression
 
@@ -12,14 +13,81 @@ class StringJoinExpression(Expression, tag='str_join'):
     Corresponds to the StringJoinExpression in TypeScript definitions.
     """
     operands: list['AnyExpression']
-    """An array of expressions whose string representations will be joined."""
+    """
+    An array of expressions whose string representations will be joined.
+    A single operand of list type has its elements joined instead: null
+    elements are treated like null operands, and a null list gives null.
+    """
     delimiter: typing.Optional[str] = None
     """An optional delimiter string to insert between joined elements."""
-
-    def to_polars(self) -> pl.Expr:
+    ignore_nulls: typing.Optional[bool] = None
+    """If true, null operands are skipped instead of making the whole result null."""
+
+    def _constant_value_impl(self) -> typing.Any:
+        if not self.operands:
+            return NOT_CONSTANT
+        values = [_string_constant(op) for op in self.operands]
+        if any(value is NOT_CONSTANT for value in values):
+            return NOT_CONSTANT
+        if self.ignore_nulls:
+            values = [value for value in values if value is not None]
+            if not values:
+                return NOT_CONSTANT
+        elif any(value is None for value in values):
+            return None
+        return (self.delimiter or "").join(values)
+
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars concat_str expression."""
-        polars_operands = [op.to_polars() for op in self.operands]
-        return pl.concat_str(polars_operands, separator=self.delimiter or "")
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value, dtype=pl.String)
+        delimiter = self.delimiter or ""
+        ignore_nulls = self.ignore_nulls or False
+        operands = _fold_string_constants(self.operands, delimiter)
+        if len(operands) == 1:
+            polars_operand = operands[0].to_polars()
+            context = current_planning_context()
+            operand_dtype = context.resolve_dtype(polars_operand) if context is not None else None
+            if isinstance(operand_dtype, pl.List):
+                # A single list column: join its elements
+                if operand_dtype.inner != pl.String:
+                    polars_operand = polars_operand.cast(pl.List(pl.String))
+                return polars_operand.list.join(delimiter, ignore_nulls=ignore_nulls)
+            if not ignore_nulls:
+                # Nothing to join with, only the string conversion is left
+                return polars_operand.cast(pl.String)
+        polars_operands = [op.to_polars() for op in operands]
+        return pl.concat_str(polars_operands, separator=delimiter, ignore_nulls=ignore_nulls)
+
+
+def _string_constant(expression: 'AnyExpression') -> typing.Any:
+    """
+    Returns the value of a constant string (or null) expression, NOT_CONSTANT
+    for anything else. Other constant types are left to Polars, whose string
+    conversion differs from Python's.
+    """
+    value = expression.constant_value()
+    if value is None or isinstance(value, str):
+        return value
+    return NOT_CONSTANT
+
+
+def _fold_string_constants(operands: list['AnyExpression'], delimiter: str) -> list['AnyExpression']:
+    """
+    Merges runs of adjacent string constants into a single constant, joined
+    with the delimiter, so that concat_str receives fewer operands.
+    """
+    folded: list['AnyExpression'] = []
+    for op in operands:
+        if (isinstance(op, ConstantValueExpression) and isinstance(op.value, str)
+                and folded and isinstance(folded[-1], ConstantValueExpression)
+                and isinstance(folded[-1].value, str)):
+            folded[-1] = ConstantValueExpression(
+                value=folded[-1].value + delimiter + op.value)
+        else:
+            folded.append(op)
+    return folded
 
 
 class ToUpperExpression(Expression, tag='to_upper'):
@@ -27,7 +95,16 @@ class ToUpperExpression(Expression, tag='to_upper'):
     value: 'AnyExpression'
     """The string expression to operate on."""
 
-    def to_polars(self) -> pl.Expr:
+    def _constant_value_impl(self) -> typing.Any:
+        value = _string_constant(self.value)
+        if value is NOT_CONSTANT or value is None:
+            return value
+        return value.upper()
+
+    def _to_polars_impl(self) -> pl.Expr:
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value, dtype=pl.String)
         return self.value.to_polars().str.to_uppercase()
 
 
@@ -36,7 +113,16 @@ class ToLowerExpression(Expression, tag='to_lower'):
     value: 'AnyExpression'
     """The string expression to operate on."""
 
-    def to_polars(self) -> pl.Expr:
+    def _constant_value_impl(self) -> typing.Any:
+        value = _string_constant(self.value)
+        if value is NOT_CONSTANT or value is None:
+            return value
+        return value.lower()
+
+    def _to_polars_impl(self) -> pl.Expr:
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value, dtype=pl.String)
         return self.value.to_polars().str.to_lowercase()
 
 
@@ -44,10 +130,16 @@ class StrLenExpression(Expression, tag='str_len'):
     """Calculates the character length of a string expression."""
     value: 'AnyExpression'
     """The string expression to operate on."""
+    byte_length: typing.Optional[bool] = None
+    """
+    If true, returns the length in bytes instead of characters. Both are the
+    same for ASCII data, and the byte length does not require decoding UTF-8.
+    """
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
+        if self.byte_length:
+            return self.value.to_polars().str.len_bytes()
         # Using len_chars for character count as per common expectation.
-        # Use .str.len_bytes() if byte length is needed.
         return self.value.to_polars().str.len_chars()
 
 
@@ -73,27 +165,73 @@ class SubstringExpression(Expression, tag='substring'):
     end: typing.Optional['AnyExpression'] = None
     """The end position of the substring (exclusive). Mutually exclusive with 'length'. Should evaluate to a number."""
 
-    def to_polars(self) -> pl.Expr:
-        """Converts the expression to a Polars str.slice expression."""
+    def __post_init__(self):
+        # Validated once on construction/decoding rather than on every render
         if self.length is not None and self.end is not None:
             raise ValueError(
                 "SubstringExpression cannot have both 'length' and 'end' defined.")
 
+    def _constant_value_impl(self) -> typing.Any:
+        value = _string_constant(self.value)
+        start = _int_constant(self.start)
+        if value is NOT_CONSTANT or start is None or start < 0:
+            return NOT_CONSTANT
+        if self.length is not None:
+            length = _int_constant(self.length)
+            if length is None or length < 0:
+                return NOT_CONSTANT
+            end = start + length
+        elif self.end is not None:
+            end = _int_constant(self.end)
+            if end is None or end < start:
+                return NOT_CONSTANT
+        else:
+            end = None
+        if value is None:
+            return None
+        return value[start:end]
+
+    def _to_polars_impl(self) -> pl.Expr:
+        """Converts the expression to a Polars str.slice expression."""
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value, dtype=pl.String)
         polars_value = self.value.to_polars()
-        polars_start = self.start.to_polars()
-        
+        start = _int_constant(self.start)
+        polars_start = start if start is not None else self.start.to_polars()
+
         if self.length is not None:
-            polars_length = self.length.to_polars()
+            length = _int_constant(self.length)
+            polars_length = length if length is not None else self.length.to_polars()
             return polars_value.str.slice(offset=polars_start, length=polars_length)
         elif self.end is not None:
-            polars_end = self.end.to_polars()
-            polars_length = polars_end - polars_start
+            end = _int_constant(self.end)
+            if start is not None and end is not None and end >= start:
+                # Both bounds are known, compute the length up front
+                polars_length = end - start
+            else:
+                polars_length = self.end.to_polars() - self.start.to_polars()
             return polars_value.str.slice(offset=polars_start, length=polars_length)
         else:
             # If neither length nor end is provided, slice to end of string
             return polars_value.str.slice(offset=polars_start)
 
 
+def _int_constant(expression: 'AnyExpression') -> typing.Optional[int]:
+    """Returns the value of an integer constant expression, None for anything else."""
+    if isinstance(expression, ConstantValueExpression) \
+            and isinstance(expression.value, int) and not isinstance(expression.value, bool):
+        return expression.value
+    return None
+
+
+def _to_polars_param(value: typing.Union['AnyExpression', str]) -> typing.Union[pl.Expr, str]:
+    """Renders an expression operand; plain strings are passed to Polars as is."""
+    if isinstance(value, Expression):
+        return value.to_polars()
+    return value
+
+
 class StringReplaceExpression(Expression, tag='str_replace'):
     """
     Represents a string replacement operation.
@@ -112,20 +250,27 @@ class StringReplaceExpression(Expression, tag='str_replace'):
     literal: typing.Optional[bool] = False
     """If true, treat pattern as literal. If false (default), treat as regex."""
 
-    def to_polars(self) -> pl.Expr:
+    def _constant_value_impl(self) -> typing.Any:
+        # Only literal replacements of constants match Python's str.replace
+        if not self.literal or not isinstance(self.pattern, str) or not self.pattern \
+                or not isinstance(self.replacement, str):
+            return NOT_CONSTANT
+        value = _string_constant(self.value)
+        if value is NOT_CONSTANT or value is None:
+            return value
+        return value.replace(self.pattern, self.replacement, -1 if self.replace_all else 1)
+
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.replace or str.replace_all expression."""
+        value = self.constant_value()
+        if value is not NOT_CONSTANT:
+            return pl.lit(value, dtype=pl.String)
         polars_value = self.value.to_polars()
 
-        if isinstance(self.pattern, Expression):
-            polars_pattern = self.pattern.to_polars()
-        else:
-            polars_pattern = pl.lit(self.pattern)
-
-        if isinstance(self.replacement, Expression):
-            polars_replacement = self.replacement.to_polars()
-        else:
-            polars_replacement = pl.lit(self.replacement)
-
+        # Plain strings are passed as is, so Polars compiles a constant
+        # pattern once for the whole column.
+        polars_pattern = _to_polars_param(self.pattern)
+        polars_replacement = _to_polars_param(self.replacement)
         use_literal = self.literal or False
 
         if self.replace_all:
@@ -159,15 +304,10 @@ class StringContainsExpression(Expression, tag='str_contains'):
     strict: typing.Optional[bool] = True
     """If true, raise an error if pattern is invalid regex. If false, return null for invalid patterns. Defaults to true."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.contains expression."""
         polars_value = self.value.to_polars()
-        
-        if isinstance(self.pattern, Expression):
-            polars_pattern = self.pattern.to_polars()
-        else:
-            polars_pattern = self.pattern
-            
+        polars_pattern = _to_polars_param(self.pattern)
         use_literal = self.literal or False
         use_strict = self.strict if self.strict is not None else True
         
@@ -191,7 +331,7 @@ class StringContainsAnyExpression(Expression, tag='str_contains_any'):
     ascii_case_insensitive: typing.Optional[bool] = False
     """Enable ASCII case insensitive matching. When this option is enabled, characters in the range A-Z will be treated as equivalent to a-z."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.contains_any expression."""
         polars_value = self.value.to_polars()
         use_ascii_case_insensitive = self.ascii_case_insensitive or False
@@ -215,15 +355,10 @@ class StringCountMatchesExpression(Expression, tag='str_count_matches'):
     literal: typing.Optional[bool] = False
     """If true, treat the pattern as a literal string. If false, treat it as a regex pattern. Defaults to false."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.count_matches expression."""
         polars_value = self.value.to_polars()
-        
-        if isinstance(self.pattern, Expression):
-            polars_pattern = self.pattern.to_polars()
-        else:
-            polars_pattern = self.pattern
-            
+        polars_pattern = _to_polars_param(self.pattern)
         use_literal = self.literal or False
         
         return polars_value.str.count_matches(
@@ -245,15 +380,10 @@ class StringExtractExpression(Expression, tag='str_extract'):
     group_index: typing.Optional[int] = 0
     """The capture group index to extract. Group 0 is the entire match, group 1 is the first capture group, etc. Defaults to 0."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.extract expression."""
         polars_value = self.value.to_polars()
-        
-        if isinstance(self.pattern, Expression):
-            polars_pattern = self.pattern.to_polars()
-        else:
-            polars_pattern = self.pattern
-            
+        polars_pattern = _to_polars_param(self.pattern)
         use_group_index = self.group_index if self.group_index is not None else 0
         
         return polars_value.str.extract(
@@ -273,15 +403,10 @@ class StringStartsWithExpression(Expression, tag='str_starts_with'):
     prefix: typing.Union['AnyExpression', str]
     """The literal string prefix to check for at the start of the string."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.starts_with expression."""
         polars_value = self.value.to_polars()
-        
-        if isinstance(self.prefix, Expression):
-            polars_prefix = self.prefix.to_polars()
-        else:
-            polars_prefix = self.prefix
-        
+        polars_prefix = _to_polars_param(self.prefix)
         return polars_value.str.starts_with(prefix=polars_prefix)
 
 
@@ -296,13 +421,13 @@ class StringEndsWithExpression(Expression, tag='str_ends_with'):
     suffix: typing.Union['AnyExpression', str]
     """The literal string suffix to check for at the end of the string."""
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars str.ends_with expression."""
         polars_value = self.value.to_polars()
-        
-        if isinstance(self.suffix, Expression):
-            polars_suffix = self.suffix.to_polars()
-        else:
-            polars_suffix = self.suffix
-        
+        polars_suffix = _to_polars_param(self.suffix)
         return polars_value.str.ends_with(suffix=polars_suffix)
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
@@ -3,7 +3,7 @@ import polars.selectors as cs
 from typing import Union, Optional, List
 
 from ptabler.common import PType, toPolarsType
-from .base import Expression
+from .base import Expression, current_planning_context
 
 AnyExpression = Expression
 
@@ -38,12 +38,15 @@ class StructFieldExpression(Expression, tag='struct_field'):
     Only constant scalar values are supported.
     """
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """
         Converts the expression to a Polars struct.field expression.
         
-        Gracefully handles null struct values using conditional logic to avoid
-        schema mismatch issues that can occur with fill_null approaches.
+        When the schema of the input table is known (inside a planning context),
+        field access is resolved at plan-build time and expressed with native
+        struct.field calls; fields absent from the schema become a constant
+        default. Otherwise, or when a requested conversion has no exact Polars
+        equivalent, values are extracted row by row with map_elements.
         
         Supports both single field access and recursive field access for nested structures.
         Applies optional dtype casting and default values as specified.
@@ -53,71 +56,116 @@ class StructFieldExpression(Expression, tag='struct_field'):
             returning null or the default value for records where the struct or field is missing.
         """
         polars_struct = self.struct.to_polars()
-        
+        fields = [self.fields] if isinstance(self.fields, str) else self.fields
+
         return_dtype = None
         if self.dtype is not None:
             return_dtype = toPolarsType(self.dtype)
-        
-        def convert_value(value):
-            if value is None:
+
+        context = current_planning_context()
+        struct_dtype = context.resolve_dtype(polars_struct) if context is not None else None
+        if struct_dtype is not None:
+            native_expr = self._native_field_access(polars_struct, struct_dtype, fields, return_dtype)
+            if native_expr is not None:
+                return native_expr
+
+        return self._map_elements_field_access(polars_struct, fields, return_dtype)
+
+    def _native_field_access(
+            self, polars_struct: pl.Expr, struct_dtype: pl.DataType,
+            fields: List[str], return_dtype: Optional[pl.DataType]) -> Optional[pl.Expr]:
+        """
+        Builds the field access from native Polars expressions, using the
+        resolved dtype of the struct. Returns None if the result would differ
+        from the row-wise implementation.
+        """
+        converted_default = _convert_value(self.default, self.dtype)
+        result_expr = polars_struct
+        current_dtype = struct_dtype
+        for field in fields:
+            if current_dtype == pl.Null:
+                # Nothing to extract from, every row gets the default
+                return pl.lit(converted_default, dtype=return_dtype)
+            if not isinstance(current_dtype, pl.Struct):
                 return None
-            if self.dtype is None:
-                return value
-            
-            try:
-                if self.dtype == "String":
-                    return str(value)
-                elif self.dtype in ["Int64", "Int32", "Int", "Long"]:
-                    return int(float(value)) if value is not None else None
-                elif self.dtype in ["Float64", "Float32", "Float", "Double"]:
-                    return float(value)
-                elif self.dtype == "Boolean":
-                    if isinstance(value, bool):
-                        return value
-                    elif isinstance(value, str):
-                        return value.lower() in ('true', '1', 'yes', 'on')
-                    else:
-                        return bool(value)
-                else:
-                    return value
-            except (ValueError, TypeError):
-                return value
-        
-        converted_default = convert_value(self.default)
-
-        if isinstance(self.fields, str):
-            def extract_single_field(x):
-                if x is not None and isinstance(x, dict):
-                    result = x.get(self.fields)
-                    if result is not None:
-                        return convert_value(result)
+            field_dtypes = {f.name: f.dtype for f in current_dtype.fields}
+            if field not in field_dtypes:
+                # The field does not exist in any record
+                return pl.lit(converted_default, dtype=return_dtype)
+            result_expr = result_expr.struct.field(field)
+            current_dtype = field_dtypes[field]
+
+        if return_dtype is not None and current_dtype != return_dtype:
+            if not _is_exact_cast(current_dtype, return_dtype):
+                return None
+            result_expr = result_expr.cast(return_dtype, strict=False)
+        if converted_default is not None:
+            result_expr = result_expr.fill_null(pl.lit(converted_default, dtype=return_dtype))
+        return result_expr
+
+    def _map_elements_field_access(
+            self, polars_struct: pl.Expr, fields: List[str],
+            return_dtype: Optional[pl.DataType]) -> pl.Expr:
+        """Extracts the field(s) row by row in Python."""
+        dtype = self.dtype
+        converted_default = _convert_value(self.default, dtype)
+
+        def extract_fields(x):
+            current = x
+            for field in fields:
+                if current is None or not isinstance(current, dict):
+                    return converted_default
+                current = current.get(field)
+
+            if current is not None:
+                return _convert_value(current, dtype)
+            else:
                 return converted_default
-            
-            result_expr = polars_struct.map_elements(
-                extract_single_field, 
-                skip_nulls=False,
-                return_dtype=return_dtype
-            )
+
+        return polars_struct.map_elements(
+            extract_fields,
+            skip_nulls=False,
+            return_dtype=return_dtype
+        )
+
+
+def _convert_value(value, dtype: Optional[PType]):
+    if value is None:
+        return None
+    if dtype is None:
+        return value
+
+    try:
+        if dtype == "String":
+            return str(value)
+        elif dtype in ["Int64", "Int32", "Int", "Long"]:
+            return int(float(value))
+        elif dtype in ["Float64", "Float32", "Float", "Double"]:
+            return float(value)
+        elif dtype == "Boolean":
+            if isinstance(value, bool):
+                return value
+            elif isinstance(value, str):
+                return value.lower() in ('true', '1', 'yes', 'on')
+            else:
+                return bool(value)
         else:
-            def extract_nested_fields(x):
-                if x is None or not isinstance(x, dict):
-                    return converted_default
-                
-                current = x
-                for field in self.fields:
-                    if current is None or not isinstance(current, dict):
-                        return converted_default
-                    current = current.get(field)
-                
-                if current is not None:
-                    return convert_value(current)
-                else:
-                    return converted_default
-            
-            result_expr = polars_struct.map_elements(
-                extract_nested_fields, 
-                skip_nulls=False,
-                return_dtype=return_dtype
-            )
-        
-        return result_expr
\ No newline at end of file
+            return value
+    except (ValueError, TypeError):
+        return value
+
+
+def _is_exact_cast(source: pl.DataType, target: pl.DataType) -> bool:
+    """
+    Whether a Polars cast from source to target yields the same values as
+    _convert_value: numeric to numeric or Boolean, and integer to String.
+    """
+    if source.is_numeric():
+        return target.is_numeric() or target == pl.Boolean or \
+            (target == pl.String and source.is_integer())
+    return False
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
@@ -27,61 +27,78 @@ class RankExpression(Expression, tag='rank'):
     Corresponds to the RankExpression in TypeScript definitions.
     Uses Polars' dense rank method by default.
     """
+    _depends_on_other_rows = True
+
     order_by: list['AnyExpression']
     partition_by: list['AnyExpression']
     descending: bool = False
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars rank window expression."""
-        polars_partitions = [p.to_polars() for p in self.partition_by]
         polars_order_exprs = [ob.to_polars() for ob in self.order_by]
 
         if not polars_order_exprs:
             raise ValueError(
                 "RankExpression requires at least one 'order_by' expression.")
 
-        rank_expr = pl.struct(polars_order_exprs).rank(
-            "ordinal", descending=self.descending)
+        if len(polars_order_exprs) == 1:
+            # A single key is ranked directly, without packing it into a struct
+            rank_expr = _single_key_rank(polars_order_exprs[0], self.descending)
+        else:
+            rank_expr = pl.struct(polars_order_exprs).rank(
+                "ordinal", descending=self.descending)
 
-        if polars_partitions:
-            return rank_expr.over(polars_partitions)
+        if self.partition_by:
+            return rank_expr.over([p.to_polars() for p in self.partition_by])
         else:
             return rank_expr
 
 
+def _single_key_rank(key: pl.Expr, descending: bool) -> pl.Expr:
+    """
+    Ordinal rank of one key, matching the rank of a single-field struct:
+    nulls are ranked too (before all values, or after them when descending)
+    in order of appearance, where a plain rank would leave them null.
+    """
+    is_null = key.is_null()
+    null_rank = is_null.cum_sum()
+    value_rank = key.rank("ordinal", descending=descending)
+    if descending:
+        null_rank = null_rank + key.count()
+    else:
+        value_rank = value_rank + key.null_count()
+    return pl.when(is_null).then(null_rank).otherwise(value_rank)
+
+
 class CumsumExpression(Expression, tag='cumsum'):
     """
     Represents a cumulative sum function applied over a dataset partition, respecting order.
     Calculates the cumulative sum of the 'value' expression within each partition,
-    based on the specified ordering (value first, then additional_order_by).
+    accumulating rows in 'additional_order_by' order (row order if it is empty).
     Corresponds to the CumsumExpression in TypeScript definitions.
     """
+    _depends_on_other_rows = True
+
     value: 'AnyExpression'
     additional_order_by: list['AnyExpression']
     partition_by: list['AnyExpression']
     descending: bool = False
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars cumsum window expression."""
-        polars_value = self.value.to_polars()
+        cumsum_expr = self.value.to_polars().cum_sum()
         polars_partitions = [p.to_polars() for p in self.partition_by]
-        polars_additional_order = [ob.to_polars()
-                                   for ob in self.additional_order_by]
-
-        combined_order_exprs = [polars_value] + polars_additional_order
-
-        descending_flags = [self.descending] * len(combined_order_exprs)
-
-        sorted_value_expr = polars_value.sort_by(
-            combined_order_exprs, descending=descending_flags,
-            maintain_order=True)
-
-        cumsum_after_sort_expr = sorted_value_expr.cum_sum()
 
+        if self.additional_order_by:
+            # over(order_by=...) accumulates in the requested order and maps the
+            # results back to the original row positions.
+            return cumsum_expr.over(
+                polars_partitions or None,
+                order_by=[ob.to_polars() for ob in self.additional_order_by],
+                descending=self.descending)
         if polars_partitions:
-            return cumsum_after_sort_expr.over(polars_partitions)
-        else:
-            return cumsum_after_sort_expr
+            return cumsum_expr.over(polars_partitions)
+        return cumsum_expr
 
 
 class WindowExpression(Expression, tag='aggregate'):
@@ -89,14 +106,15 @@ class WindowExpression(Expression, tag='aggregate'):
     Represents a generic window function call (e.g., sum, mean over a partition).
     Corresponds to the WindowExpression in TypeScript definitions.
     """
+    _depends_on_other_rows = True
+
     aggregation: AggregationType
     value: 'AnyExpression'
     partition_by: list['AnyExpression']
 
-    def to_polars(self) -> pl.Expr:
+    def _to_polars_impl(self) -> pl.Expr:
         """Converts the expression to a Polars window expression."""
         polars_value = self.value.to_polars()
-        polars_partitions = [p.to_polars() for p in self.partition_by]
 
         agg_expr: pl.Expr
         match self.aggregation:
@@ -125,7 +143,12 @@ class WindowExpression(Expression, tag='aggregate'):
             case _:
                 raise ValueError(f"Unsupported window operation: {self.operation}")
 
-        if polars_partitions:
-            return agg_expr.over(polars_partitions)
+        if self.partition_by:
+            return agg_expr.over([p.to_polars() for p in self.partition_by])
         else:
             return agg_expr
+
+
+# Last, once all classes above exist: lets the package inject AnyExpression
+from . import _submodule_loaded
+_submodule_loaded(__name__)
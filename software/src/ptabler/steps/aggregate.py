@@ -3,7 +3,7 @@ import msgspec
 from typing import Union, List
 
 from .base import GlobalSettings, PStep, TableSpace
-from ..expression import AnyExpression
+from ..expression import AnyExpression, planning_context
 
 
 class BaseAggregationOperation(msgspec.Struct, frozen=True, tag_field='aggregation', rename="camel"):
@@ -147,11 +147,10 @@ class Aggregate(PStep, tag="aggregate"):
             )
 
         lf = table_space[self.input_table]
-        polars_aggs_to_apply = [op_config.to_polars().alias(op_config.name)
-                                for op_config in self.aggregations]
+        with planning_context(lf):
+            polars_aggs_to_apply = [op_config.to_polars().alias(op_config.name)
+                                    for op_config in self.aggregations]
 
-        aggregated_lf: pl.LazyFrame
-        if len(self.group_by) > 0:
             polars_group_by_exprs: List[Union[str, pl.Expr]] = []
             for item in self.group_by:
                 if isinstance(item, str):
@@ -161,6 +160,8 @@ class Aggregate(PStep, tag="aggregate"):
                 else:
                     raise TypeError(f"Invalid type in group_by list: {type(item)}. Expected str or Expression.")
 
+        aggregated_lf: pl.LazyFrame
+        if len(self.group_by) > 0:
             aggregated_lf = lf.group_by(
                 polars_group_by_exprs, maintain_order=True).agg(polars_aggs_to_apply)
         else:
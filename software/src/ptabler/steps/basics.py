@@ -3,7 +3,7 @@ import msgspec
 from typing import List
 
 from .base import GlobalSettings, PStep, TableSpace
-from ..expression import AnyExpression
+from ..expression import AnyExpression, planning_context
 
 
 class ColumnDefinition(msgspec.Struct, frozen=True, rename="camel"):
@@ -15,6 +15,15 @@ class ColumnDefinition(msgspec.Struct, frozen=True, rename="camel"):
     expression: AnyExpression
 
 
+def _to_polars_columns(columns: List[ColumnDefinition], lf: pl.LazyFrame) -> list[pl.Expr]:
+    """
+    Converts column definitions to Polars expressions aliased to the column
+    names, lowering all of them in one planning context over the input frame.
+    """
+    with planning_context(lf):
+        return [col_def.expression.to_polars().alias(col_def.name) for col_def in columns]
+
+
 class AddColumns(PStep, tag="add_columns"):
     """
     PStep to add one or more new columns to an existing table in the tablespace.
@@ -47,23 +56,16 @@ class AddColumns(PStep, tag="add_columns"):
                 f"Available tables: {list(table_space.keys())}"
             )
 
-        lf = table_space[self.table]
+        if not self.columns:
+            # Nothing to add, the tablespace is left as is
+            return table_space, []
 
-        polars_expressions_to_add = []
-        for col_def in self.columns:
-            # Each Expression object has a to_polars() method that converts it
-            # to a Polars expression. It's then aliased to the new column name.
-            polars_expr = col_def.expression.to_polars().alias(col_def.name)
-            polars_expressions_to_add.append(polars_expr)
+        lf = table_space[self.table]
 
-        if polars_expressions_to_add:
-            lf = lf.with_columns(polars_expressions_to_add)
+        polars_expressions_to_add = _to_polars_columns(self.columns, lf)
 
         # Update the tablespace with the modified LazyFrame
-        updated_table_space = table_space.copy()
-        updated_table_space[self.table] = lf
-        
-        return updated_table_space, []
+        return {**table_space, self.table: lf.with_columns(polars_expressions_to_add)}, []
 
 
 class Select(PStep, tag="select"):
@@ -100,17 +102,14 @@ class Select(PStep, tag="select"):
 
         lf_input = table_space[self.input_table]
 
-        polars_expressions_to_select = []
         if not self.columns:
             # According to Polars docs, select with no arguments is pl.DataFrame() (empty)
             # pl.select([]) also seems to produce an empty df. 
             # If user wants all columns, they should use specific expressions or a future pl.all() like expression.
             # For now, an empty columns list will result in an empty DataFrame for select.
             pass # lf_output will be lf_input.select([]) which is an empty DF
-        
-        for col_def in self.columns:
-            polars_expr = col_def.expression.to_polars().alias(col_def.name)
-            polars_expressions_to_select.append(polars_expr)
+
+        polars_expressions_to_select = _to_polars_columns(self.columns, lf_input)
 
         lf_output = lf_input.select(polars_expressions_to_select)
 
@@ -154,10 +153,7 @@ class WithColumns(PStep, tag="with_columns"):
 
         lf_input = table_space[self.input_table]
 
-        polars_expressions_to_add = []
-        for col_def in self.columns:
-            polars_expr = col_def.expression.to_polars().alias(col_def.name)
-            polars_expressions_to_add.append(polars_expr)
+        polars_expressions_to_add = _to_polars_columns(self.columns, lf_input)
 
         # If polars_expressions_to_add is empty, lf.with_columns([]) is a no-op, returning the original lf.
         lf_output = lf_input.with_columns(polars_expressions_to_add)
@@ -2,7 +2,7 @@ import polars as pl
 import msgspec
 
 from .base import GlobalSettings, PStep, TableSpace
-from ..expression import AnyExpression
+from ..expression import AnyExpression, planning_context
 
 
 class Filter(PStep, tag="filter"):
@@ -42,7 +42,8 @@ class Filter(PStep, tag="filter"):
         lf = table_space[self.input_table]
 
         # Convert the condition Expression to a Polars expression
-        polars_condition = self.condition.to_polars()
+        with planning_context(lf):
+            polars_condition = self.condition.to_polars()
 
         # Apply the filter
         filtered_lf = lf.filter(polars_condition)
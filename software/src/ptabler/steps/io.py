@@ -98,7 +98,12 @@ class ReadCsv(BaseReadLogic, tag="read_csv"):
         """
         if self.delimiter is not None:
             scan_kwargs["separator"] = self.delimiter
-    
+
+        # The scan feeds lazy plans (usually ending in a sink), so neither a
+        # final rechunk (a full copy of every column) nor scan caching pays off.
+        scan_kwargs.setdefault("rechunk", False)
+        scan_kwargs.setdefault("cache", False)
+
         return pl.scan_csv(file_path, **scan_kwargs)
 
 class ReadNdjson(BaseReadLogic, tag="read_ndjson"):
@@ -174,6 +179,8 @@ class WriteCsv(BaseWriteLogic, tag="write_csv"):
 
     columns: Optional[List[str]] = None  # Optional: List of column names to write
     delimiter: Optional[str] = None      # Optional: The delimiter character for the output CSV
+    batch_size: Optional[int] = None     # Optional: Number of rows formatted per write batch
+    maintain_order: Optional[bool] = None  # Optional: If False, rows may be written in any order
 
     def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
         """
@@ -182,7 +189,11 @@ class WriteCsv(BaseWriteLogic, tag="write_csv"):
         sink_kwargs: Dict[str, Any] = {}
         if self.delimiter is not None:
             sink_kwargs["separator"] = self.delimiter
-        
+        if self.batch_size is not None:
+            sink_kwargs["batch_size"] = self.batch_size
+        if self.maintain_order is not None:
+            sink_kwargs["maintain_order"] = self.maintain_order
+
         # Polars' sink_csv method with lazy=True prepares a plan that includes writing the CSV.
         # It returns a DataFrame which, when collected, performs the write
         # and contains status information.
@@ -219,9 +230,14 @@ class WriteNdjson(BaseWriteLogic, tag="write_ndjson"):
     table: str  # Name of the table in the tablespace to write
     file: str   # Path to the output NDJSON file
     columns: Optional[List[str]] = None  # Optional: List of column names to write
+    maintain_order: Optional[bool] = None  # Optional: If False, rows may be written in any order
 
     def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
         """
         Prepares a Polars plan to write the selected LazyFrame to an NDJSON file.
         """
-        return selected_lf.sink_ndjson(path=output_path, lazy=True)
+        sink_kwargs: Dict[str, Any] = {}
+        if self.maintain_order is not None:
+            sink_kwargs["maintain_order"] = self.maintain_order
+
+        return selected_lf.sink_ndjson(path=output_path, lazy=True, **sink_kwargs)
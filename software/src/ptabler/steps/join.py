@@ -61,47 +61,12 @@ class Join(PStep, tag="join"):
         left_lf = table_space[self.left_table]
         right_lf = table_space[self.right_table]
 
-        left_mapping = {}
-        right_mapping = {}
+        left_mapping: dict[str, str] = {}
+        right_mapping: dict[str, str] = {}
         if self.left_columns is not None:
-            select_expressions = []
-            # Tracks the final names of columns that will be produced by explicit mappings
-            selected_final_names = set()
-
-            # Process explicit column mappings
-            for mapping in self.left_columns:
-                original_name = mapping.column
-                final_name = mapping.rename if mapping.rename is not None else original_name
-                select_expressions.append(pl.col(original_name).alias(final_name))
-                left_mapping[original_name] = final_name
-                selected_final_names.add(final_name)
-            
-            # Ensure join keys (original names from self.left_on) are included if not already covered by explicit mappings
-            if self.left_on:
-                for original_ln_key_name in self.left_on:
-                    if original_ln_key_name not in left_mapping: # If original key not in explicit column mappings
-                        select_expressions.append(pl.col(original_ln_key_name)) # then identity select it
-
-            left_lf = left_lf.select(select_expressions)
-
+            left_lf, left_mapping = _select_join_columns(left_lf, self.left_columns, self.left_on)
         if self.right_columns is not None:
-            select_expressions_right = []
-            selected_final_names_right = set()
-
-            for mapping in self.right_columns:
-                original_name = mapping.column
-                final_name = mapping.rename if mapping.rename is not None else original_name
-                select_expressions_right.append(pl.col(original_name).alias(final_name))
-                right_mapping[original_name] = final_name
-                selected_final_names_right.add(final_name)
-
-            if self.right_on:
-                for original_rn_key_name in self.right_on:
-                    if original_rn_key_name not in right_mapping: # If original key not in explicit column mappings
-                        select_expressions_right.append(pl.col(original_rn_key_name)) # then identity select it
-            
-            right_lf = right_lf.select(select_expressions_right)
-
+            right_lf, right_mapping = _select_join_columns(right_lf, self.right_columns, self.right_on)
 
         joined_lf: pl.LazyFrame
 
@@ -129,3 +94,33 @@ class Join(PStep, tag="join"):
         updated_table_space[self.output_table] = joined_lf
 
         return updated_table_space, []
+
+
+def _select_join_columns(
+        lf: pl.LazyFrame, columns: List[ColumnMapping],
+        join_keys: Optional[list[str]]) -> tuple[pl.LazyFrame, dict[str, str]]:
+    """
+    Projects a join input to the mapped columns, renaming where requested, and
+    keeps join keys that are not covered by the mappings.
+
+    Returns the projected frame and the mapping from original to final column names.
+    """
+    mapping: dict[str, str] = {}
+    select_expressions: list[pl.Expr] = []
+    for column_mapping in columns:
+        original_name = column_mapping.column
+        if column_mapping.rename is None or column_mapping.rename == original_name:
+            # Plain projection, no alias node needed
+            select_expressions.append(pl.col(original_name))
+            mapping[original_name] = original_name
+        else:
+            select_expressions.append(pl.col(original_name).alias(column_mapping.rename))
+            mapping[original_name] = column_mapping.rename
+
+    # Ensure join keys (original names) are included if not already covered by explicit mappings
+    if join_keys:
+        for key in join_keys:
+            if key not in mapping:
+                select_expressions.append(pl.col(key))
+
+    return lf.select(select_expressions), mapping
@@ -3,7 +3,7 @@ import msgspec
 from typing import List, Optional
 
 from .base import GlobalSettings, PStep, TableSpace
-from ..expression import AnyExpression
+from ..expression import AnyExpression, planning_context
 
 
 class SortDirective(msgspec.Struct, frozen=True, rename="camel"):
@@ -59,20 +59,21 @@ class Sort(PStep, tag="sort"):
         descending_flags: List[bool] = []
         nulls_last_flags: List[bool] = []
 
-        for directive in self.by:
-            sort_by_expressions.append(directive.value.to_polars())
+        with planning_context(lf):
+            for directive in self.by:
+                sort_by_expressions.append(directive.value.to_polars())
             
-            current_descending = directive.descending if directive.descending is not None else False
-            descending_flags.append(current_descending)
+                current_descending = directive.descending if directive.descending is not None else False
+                descending_flags.append(current_descending)
 
-            if directive.nulls_last is not None:
-                nulls_last_flags.append(directive.nulls_last)
-            else:
-                # Polars default: nulls are smallest.
-                # If ascending (current_descending=False), nulls first (nulls_last=False).
-                # If descending (current_descending=True), nulls last (nulls_last=True).
-                # So, if directive.nulls_last is None, it should align with current_descending.
-                nulls_last_flags.append(current_descending)
+                if directive.nulls_last is not None:
+                    nulls_last_flags.append(directive.nulls_last)
+                else:
+                    # Polars default: nulls are smallest.
+                    # If ascending (current_descending=False), nulls first (nulls_last=False).
+                    # If descending (current_descending=True), nulls last (nulls_last=True).
+                    # So, if directive.nulls_last is None, it should align with current_descending.
+                    nulls_last_flags.append(current_descending)
         
         sorted_lf = lf.sort(
             by=sort_by_expressions,
@@ -1,8 +1,11 @@
+import functools
+
 import msgspec
 import polars as pl
-from typing import List, overload, Literal, Tuple, Union
+from typing import Dict, List, overload, Literal, Tuple, Union
 
-from ptabler.steps import AnyPStep, GlobalSettings, TableSpace
+from ptabler.expression import AndExpression
+from ptabler.steps import AddColumns, AnyPStep, Filter, GlobalSettings, PStep, TableSpace
 
 
 class PWorkflow(msgspec.Struct):
@@ -17,6 +20,14 @@ class PWorkflow(msgspec.Struct):
     """
     workflow: List[AnyPStep]
 
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "PWorkflow":
+        """
+        Decodes a workflow from its JSON representation, reusing a decoder
+        that is built once per process.
+        """
+        return _json_decoder().decode(data)
+
     @overload
     def execute(self, global_settings: GlobalSettings, initial_table_space: TableSpace | None = None) -> None:
         ...
@@ -40,6 +51,13 @@ class PWorkflow(msgspec.Struct):
            `table_space` and a list of any sink LazyFrames it generated.
         3. These sink LazyFrames are accumulated.
 
+        Adjacent steps that can be executed as one (independent AddColumns
+        steps on the same table, chained Filter steps) are merged beforehand.
+        If `lazy` is True, every table and sink must be a `pl.LazyFrame`, so
+        that nothing is computed before the caller collects; a `TypeError` is
+        raised otherwise. If `lazy` is False, `pl.DataFrame`s in the initial
+        tablespace are converted with `.lazy()`.
+
         If `lazy` is False (default), after all steps are processed,
         `polars.collect_all()` is called on the accumulated sink LazyFrames
         to execute these I/O-bound operations. The `streaming=True` option
@@ -68,11 +86,22 @@ class PWorkflow(msgspec.Struct):
         table_space: TableSpace = initial_table_space if initial_table_space is not None else {}
         all_sink_lazyframes: List[pl.LazyFrame] = []
 
-        for step_obj in self.workflow:
+        if lazy:
+            _check_lazy(table_space, [], "the initial tablespace")
+        else:
+            # Eager callers may pass DataFrames; the steps build lazy plans.
+            table_space = {
+                name: frame.lazy() if isinstance(frame, pl.DataFrame) else frame
+                for name, frame in table_space.items()
+            }
+
+        for step_obj in _fuse_steps(self.workflow):
             table_space, step_sink_lazyframes = step_obj.execute(
                 table_space=table_space,
                 global_settings=global_settings
             )
+            if lazy:
+                _check_lazy(table_space, step_sink_lazyframes, f"step '{type(step_obj).__name__}'")
             all_sink_lazyframes.extend(step_sink_lazyframes)
 
         if lazy:
@@ -87,3 +116,94 @@ class PWorkflow(msgspec.Struct):
                 _ = pl.collect_all(all_sink_lazyframes)
                 # Future consideration: Add logging for workflow completion or errors.
             return None
+
+    def execute_collected(self, global_settings: GlobalSettings, target_tables: List[str], initial_table_space: TableSpace | None = None) -> Dict[str, pl.DataFrame]:
+        """
+        Executes the workflow and returns the named tables as DataFrames.
+
+        The target tables and the workflow's sink operations are computed in
+        a single `polars.collect_all()` call, so work they have in common
+        (e.g. reading the same input) is optimized and executed once.
+
+        Args:
+            global_settings: Global configuration for the workflow.
+            target_tables: Names of the tables in the final tablespace to return.
+            initial_table_space: An optional `TableSpace` to initialize the
+                                 workflow's table space.
+
+        Returns:
+            A dictionary mapping each target table name to its collected DataFrame.
+        """
+        table_space, sink_lazyframes = self.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+        for table_name in target_tables:
+            if table_name not in table_space:
+                raise ValueError(
+                    f"Table '{table_name}' not found in tablespace. "
+                    f"Available tables: {list(table_space.keys())}"
+                )
+
+        collected = pl.collect_all(
+            [table_space[table_name] for table_name in target_tables] + sink_lazyframes)
+        return dict(zip(target_tables, collected))
+
+
+def _check_lazy(table_space: TableSpace, sink_lazyframes: List[pl.LazyFrame], source: str) -> None:
+    """Raises a TypeError if `source` produced a table or sink that is not a LazyFrame."""
+    for name, frame in table_space.items():
+        if not isinstance(frame, pl.LazyFrame):
+            raise TypeError(
+                f"Table '{name}' from {source} is a {type(frame).__name__}, "
+                f"expected a LazyFrame.")
+    for frame in sink_lazyframes:
+        if not isinstance(frame, pl.LazyFrame):
+            raise TypeError(
+                f"Sink from {source} is a {type(frame).__name__}, expected a LazyFrame.")
+
+
+def _fuse_steps(steps: List[PStep]) -> List[PStep]:
+    """
+    Merges adjacent steps that can be executed as one, so that Polars gets
+    a single plan node instead of a chain of them. Merged steps produce the
+    same tablespace as the original sequence.
+    """
+    fused: List[PStep] = []
+    for step in steps:
+        merged = _merge_steps(fused[-1], step) if fused else None
+        if merged is not None:
+            fused[-1] = merged
+        else:
+            fused.append(step)
+    return fused
+
+
+def _merge_steps(first: PStep, second: PStep) -> PStep | None:
+    """Returns a single step equivalent to running `first` then `second`, or None."""
+    if isinstance(first, AddColumns) and isinstance(second, AddColumns) \
+            and first.table == second.table:
+        # All columns of one step are computed from the step's input, so the
+        # second step must not read (or redefine) a column the first adds.
+        added = {col_def.name for col_def in first.columns}
+        if all(col_def.name not in added and added.isdisjoint(col_def.expression.column_references())
+               for col_def in second.columns):
+            return AddColumns(table=first.table, columns=first.columns + second.columns)
+    if isinstance(first, Filter) and isinstance(second, Filter) \
+            and second.input_table == second.output_table == first.output_table \
+            and second.condition.is_row_wise():
+        # Filtering the filtered table again is one filter on the conjunction,
+        # unless the second condition looks at other rows (window functions).
+        return Filter(
+            input_table=first.input_table,
+            output_table=first.output_table,
+            condition=AndExpression(operands=[first.condition, second.condition]))
+    return None
+
+
+@functools.cache
+def _json_decoder() -> msgspec.json.Decoder:
+    # Built on first use rather than at import time, so importing the
+    # package does not resolve every step and expression type up front.
+    return msgspec.json.Decoder(PWorkflow)
@@ -1,5 +1,7 @@
 import unittest
 import os
+import polars as pl
+from polars.testing import assert_frame_equal
 from ptabler.workflow import PWorkflow
 from ptabler.steps import GlobalSettings, ReadCsv, WriteCsv
 
@@ -8,6 +10,7 @@ test_data_root_dir = os.path.join(
     os.path.dirname(os.path.dirname(current_script_dir)),
     "test_data")
 global_settings = GlobalSettings(root_folder=test_data_root_dir)
+os.makedirs(os.path.join(test_data_root_dir, "outputs"), exist_ok=True)
 
 class BasicTest(unittest.TestCase):
 
@@ -43,3 +46,92 @@ class BasicTest(unittest.TestCase):
         finally:
             if os.path.exists(output_file_abs_path):
                 os.remove(output_file_abs_path)
+
+    def test_write_csv_unordered_batches(self):
+        output_file_relative_path = "output_unordered_batches.csv"
+        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+
+        read_step = ReadCsv(
+            file="test_data_1.tsv",
+            name="input_table",
+            delimiter="\t"
+        )
+
+        write_step = WriteCsv(
+            table="input_table",
+            file=f"outputs/{output_file_relative_path}",
+            batch_size=2,
+            maintain_order=False
+        )
+
+        ptw = PWorkflow(workflow=[read_step, write_step])
+
+        if os.path.exists(output_file_abs_path):
+            os.remove(output_file_abs_path)
+
+        try:
+            ptw.execute(global_settings=global_settings)
+
+            # Rows may come out in any order, but all of them must be written
+            expected_df = pl.read_csv(
+                os.path.join(test_data_root_dir, "test_data_1.tsv"), separator="\t")
+            result_df = pl.read_csv(output_file_abs_path)
+            assert_frame_equal(result_df, expected_df, check_row_order=False)
+
+        finally:
+            if os.path.exists(output_file_abs_path):
+                os.remove(output_file_abs_path)
+
+    def test_read_csv_sees_rewritten_file(self):
+        input_file_relative_path = os.path.join("outputs", "rewritten_input.csv")
+        input_file_abs_path = os.path.join(test_data_root_dir, input_file_relative_path)
+        ptw = PWorkflow(workflow=[ReadCsv(file=input_file_relative_path, name="t")])
+
+        try:
+            # Same size on both runs, so only the content differs
+            pl.DataFrame({"a": [1, 2]}).write_csv(input_file_abs_path)
+            table_space, _ = ptw.execute(global_settings=global_settings, lazy=True)
+            assert_frame_equal(table_space["t"].collect(), pl.DataFrame({"a": [1, 2]}))
+
+            pl.DataFrame({"a": [3, 4]}).write_csv(input_file_abs_path)
+            table_space, _ = ptw.execute(global_settings=global_settings, lazy=True)
+            assert_frame_equal(table_space["t"].collect(), pl.DataFrame({"a": [3, 4]}))
+        finally:
+            if os.path.exists(input_file_abs_path):
+                os.remove(input_file_abs_path)
+
+    def test_workflow_from_json(self):
+        content = (
+            '{"workflow": ['
+            '{"type": "read_csv", "file": "test_data_1.tsv", "name": "t", "delimiter": "\\t"},'
+            '{"type": "write_csv", "table": "t", "file": "outputs/out.csv"}'
+            ']}'
+        )
+
+        ptw = PWorkflow.from_json(content)
+
+        self.assertEqual(ptw.workflow, [
+            ReadCsv(file="test_data_1.tsv", name="t", delimiter="\t"),
+            WriteCsv(table="t", file="outputs/out.csv"),
+        ])
+        # The decoder is reused for subsequent documents
+        self.assertEqual(PWorkflow.from_json(content), ptw)
+
+    def test_workflow_eager_tables(self):
+        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", "eager.csv")
+        if os.path.exists(output_file_abs_path):
+            os.remove(output_file_abs_path)
+        input_df = pl.DataFrame({"a": [1, 2]})
+        ptw = PWorkflow(workflow=[WriteCsv(table="t", file="outputs/eager.csv")])
+
+        # Lazy execution only accepts LazyFrames
+        with self.assertRaises(TypeError):
+            ptw.execute(
+                global_settings=global_settings,
+                lazy=True,
+                initial_table_space={"t": input_df}
+            )
+
+        # Eager execution converts DataFrames and runs the sinks
+        ptw.execute(global_settings=global_settings, initial_table_space={"t": input_df})
+        assert_frame_equal(pl.read_csv(output_file_abs_path), input_df)
@@ -1,15 +1,22 @@
+import os
+import subprocess
+import sys
 import unittest
+from unittest import mock
 import polars as pl
 from polars.testing import assert_frame_equal
 import math # Added for math.ceil in expected value generation logic
 
 from ptabler.workflow import PWorkflow
+from ptabler.workflow.workflow import _fuse_steps
+from ptabler.expression.base import NOT_CONSTANT
+from ptabler.expression.basics import BinaryOperatorExpression
 from ptabler.steps import GlobalSettings, AddColumns, Filter, TableSpace
 from ptabler.steps.basics import ColumnDefinition
 from ptabler.expression import (
     ColumnReferenceExpression, ConstantValueExpression,
-    PlusExpression, EqExpression, GtExpression, AndExpression,
-    ToUpperExpression, StringJoinExpression, SubstringExpression,
+    PlusExpression, TrueDivExpression, EqExpression, GtExpression, AndExpression,
+    ToUpperExpression, ToLowerExpression, StrLenExpression, StringJoinExpression, SubstringExpression,
     CumsumExpression, RankExpression, WindowExpression,
     StringDistanceExpression, FuzzyStringFilterExpression,
     WhenThenClause, WhenThenOtherwiseExpression,
@@ -18,7 +25,9 @@ from ptabler.expression import (
     StringContainsExpression, StringContainsAnyExpression, StringCountMatchesExpression,
     StringExtractExpression, StringStartsWithExpression, StringEndsWithExpression,
     FillNaExpression,
-    UnaryMinusExpression,
+    UnaryMinusExpression, Log2Expression, NotExpression, IsNaExpression,
+    StructFieldExpression,
+    planning_context,
 )
 
 # Minimal global_settings for tests not relying on file I/O from a specific root_folder
@@ -27,6 +36,15 @@ global_settings = GlobalSettings(root_folder=".")
 
 class StepTests(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the inputs shared by several tests; steps never mutate LazyFrames."""
+        cls.names_df = pl.DataFrame({
+            "id": [1, 2],
+            "first": ["john", "jane"],
+            "last": ["doe", "smith"]
+        }).lazy()
+
     def test_add_columns_arithmetic(self):
         """
         Tests AddColumns step with a simple arithmetic expression.
@@ -74,12 +92,12 @@ class StepTests(unittest.TestCase):
         Tests Filter step with a compound condition: value > 75 AND category == "A".
         The filtered result is stored in a new table "filtered_output".
         """
-        initial_df = pl.DataFrame({
+        initial_data = pl.DataFrame({
             "id": [1, 2, 3, 4],
             "value": [100, 50, 120, 80],
             "category": ["A", "B", "A", "B"]
-        }).lazy()
-        initial_table_space: TableSpace = {"source_table": initial_df}
+        })
+        initial_table_space: TableSpace = {"source_table": initial_data.lazy()}
 
         filter_step = Filter(
             input_table="source_table",
@@ -97,9 +115,10 @@ class StepTests(unittest.TestCase):
         )
 
         workflow = PWorkflow(workflow=[filter_step])
-        final_table_space, _ = workflow.execute(
+        # Both tables share the source scan, so they are collected together
+        results = workflow.execute_collected(
             global_settings=global_settings,
-            lazy=True,
+            target_tables=["filtered_output", "source_table"],
             initial_table_space=initial_table_space
         )
 
@@ -109,15 +128,9 @@ class StepTests(unittest.TestCase):
             "category": ["A", "A"]
         })
 
-        self.assertTrue("filtered_output" in final_table_space)
-        result_df = final_table_space["filtered_output"].collect()
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
-
-        # Ensure original table is still present and unchanged if needed for other tests,
-        # though Filter creates a new one.
-        self.assertTrue("source_table" in final_table_space)
-        original_df_collected = final_table_space["source_table"].collect()
-        assert_frame_equal(original_df_collected, initial_df.collect())
+        # Ensure original table is still present and unchanged, though Filter creates a new one.
+        assert_frame_equal(results["filtered_output"], expected_df, check_dtypes=True)
+        assert_frame_equal(results["source_table"], initial_data)
 
     def test_add_columns_string_operations_sequential(self):
         """
@@ -125,12 +138,7 @@ class StepTests(unittest.TestCase):
         1. Add 'first_upper' = to_upper(col("first"))
         2. Add 'full_name' = str_join([col("first_upper"), const(" "), col("last")])
         """
-        initial_df = pl.DataFrame({
-            "id": [1, 2],
-            "first": ["john", "jane"],
-            "last": ["doe", "smith"]
-        }).lazy()
-        initial_table_space: TableSpace = {"names_table": initial_df}
+        initial_table_space: TableSpace = {"names_table": self.names_df}
 
         add_upper_step = AddColumns(
             table="names_table",
@@ -177,8 +185,160 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["names_table"].collect()
-        # Order of columns might differ, so select in expected order for comparison
-        result_df = result_df.select(expected_df.columns)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
+
+    def test_independent_add_columns_steps_are_fused(self):
+        """
+        Tests that adjacent AddColumns steps on the same table are merged into
+        one step unless the later step reads a column added by the earlier one.
+        """
+        add_upper = AddColumns(table="names_table", columns=[
+            ColumnDefinition(name="first_upper", expression=ToUpperExpression(
+                value=ColumnReferenceExpression(name="first")))
+        ])
+        add_lower = AddColumns(table="names_table", columns=[
+            ColumnDefinition(name="last_lower", expression=ToLowerExpression(
+                value=ColumnReferenceExpression(name="last")))
+        ])
+        add_dependent = AddColumns(table="names_table", columns=[
+            ColumnDefinition(name="first_upper_len", expression=StrLenExpression(
+                value=ColumnReferenceExpression(name="first_upper")))
+        ])
+
+        fused = _fuse_steps([add_upper, add_lower, add_dependent])
+        self.assertEqual(len(fused), 2)
+        self.assertEqual([c.name for c in fused[0].columns], ["first_upper", "last_lower"])
+        self.assertIs(fused[1], add_dependent)
+
+        initial_table_space: TableSpace = {"names_table": pl.DataFrame({
+            "first": ["john", "jane"],
+            "last": ["DOE", "SMITH"]
+        }).lazy()}
+        workflow = PWorkflow(workflow=[add_upper, add_lower, add_dependent])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "first": ["john", "jane"],
+            "last": ["DOE", "SMITH"],
+            "first_upper": ["JOHN", "JANE"],
+            "last_lower": ["doe", "smith"],
+            "first_upper_len": [4, 4]
+        }, schema_overrides={"first_upper_len": pl.UInt32})
+        result_df = final_table_space["names_table"].collect()
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_chained_filter_steps_are_fused(self):
+        """
+        Tests that a Filter on the output of a previous Filter is merged into it,
+        except when its condition uses a window function, and that nested 'and'
+        operands evaluate like a flat conjunction.
+        """
+        value_filter = Filter(
+            input_table="source_table",
+            output_table="filtered",
+            condition=GtExpression(
+                lhs=ColumnReferenceExpression(name="value"),
+                rhs=ConstantValueExpression(value=10)))
+        category_filter = Filter(
+            input_table="filtered",
+            output_table="filtered",
+            condition=AndExpression(operands=[
+                EqExpression(lhs=ColumnReferenceExpression(name="category"),
+                             rhs=ConstantValueExpression(value="A")),
+                AndExpression(operands=[
+                    GtExpression(lhs=ColumnReferenceExpression(name="id"),
+                                 rhs=ConstantValueExpression(value=1))
+                ])
+            ]))
+        top_filter = Filter(
+            input_table="filtered",
+            output_table="filtered",
+            condition=EqExpression(
+                lhs=RankExpression(
+                    order_by=[ColumnReferenceExpression(name="value")],
+                    partition_by=[],
+                    descending=True),
+                rhs=ConstantValueExpression(value=1)))
+
+        fused = _fuse_steps([value_filter, category_filter, top_filter])
+        self.assertEqual(len(fused), 2)
+        self.assertEqual(fused[0].input_table, "source_table")
+        self.assertEqual(fused[0].output_table, "filtered")
+        self.assertIs(fused[1], top_filter)
+
+        initial_table_space: TableSpace = {"source_table": pl.DataFrame({
+            "id": [1, 2, 3, 4, 5],
+            "value": [50, 5, 30, 40, 60],
+            "category": ["A", "A", "A", "B", "A"]
+        }).lazy()}
+        workflow = PWorkflow(workflow=[value_filter, category_filter, top_filter])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        # Rows 3 and 5 pass the first two filters; the rank is taken among those
+        expected_df = pl.DataFrame({
+            "id": [5],
+            "value": [60],
+            "category": ["A"]
+        })
+        result_df = final_table_space["filtered"].collect()
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_add_columns_string_operations_single_step(self):
+        """
+        Tests the same string operations as above in a single AddColumns step:
+        'full_name' repeats the to_upper expression instead of referring to
+        'first_upper', so both columns are computed in one projection.
+        """
+        initial_table_space: TableSpace = {"names_table": self.names_df}
+
+        add_step = AddColumns(
+            table="names_table",
+            columns=[
+                ColumnDefinition(
+                    name="first_upper",
+                    expression=ToUpperExpression(
+                        value=ColumnReferenceExpression(name="first")
+                    )
+                ),
+                ColumnDefinition(
+                    name="full_name",
+                    expression=StringJoinExpression(
+                        operands=[
+                            ToUpperExpression(
+                                value=ColumnReferenceExpression(name="first")
+                            ),
+                            ConstantValueExpression(value=" "),
+                            ColumnReferenceExpression(name="last")
+                        ]
+                    )
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[add_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "id": [1, 2],
+            "first": ["john", "jane"],
+            "last": ["doe", "smith"],
+            "first_upper": ["JOHN", "JANE"],
+            "full_name": ["JOHN doe", "JANE smith"]
+        })
+
+        result_df = final_table_space["names_table"].collect()
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_cumsum_expression(self):
@@ -223,11 +383,12 @@ class StepTests(unittest.TestCase):
             "category": ["A", "A", "A", "B", "B", "B"],
             "value": [10, 20, 15, 5, 10, 20],
             "order_col": [1, 2, 3, 1, 2, 3],
-            "value_cumsum": [10, 25, 45, 5, 15, 35]
+            # Accumulated in order_col order within each category: 10, 20, 15 / 5, 10, 20
+            "value_cumsum": [10, 30, 45, 5, 15, 35]
         })
 
-        result_df = final_table_space["data_table"].collect().sort(
-            ["category", "order_col"])
+        result_df = final_table_space["data_table"].sort(
+            ["category", "order_col"]).collect(engine="streaming")
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_rank_expression(self):
@@ -267,10 +428,9 @@ class StepTests(unittest.TestCase):
             initial_table_space=initial_table_space
         )
 
-        result_df_collected = final_table_space["data_table"].collect()
-
-        result_df_sorted = result_df_collected.sort(
-            ["category", "value", "id"], descending=[False, True, True])
+        result_df_sorted = final_table_space["data_table"].sort(
+            ["category", "value", "id"], descending=[False, True, True]
+        ).collect(engine="streaming")
 
         expected_df = pl.DataFrame({
             "id": [3, 5, 1, 6, 4, 2],
@@ -283,6 +443,44 @@ class StepTests(unittest.TestCase):
 
         assert_frame_equal(result_df_sorted, expected_df, check_dtypes=True)
 
+    def test_rank_expression_single_key_with_nulls(self):
+        """
+        Tests that a single order key ranks nulls like the multi-key (struct)
+        ordering does: nulls come first, or last when descending.
+        """
+        df = pl.DataFrame({
+            "key": [2, None, 0, 1, None],
+            "group": ["A", "A", "A", "A", "B"],
+        })
+
+        def rank(descending, partition_by):
+            return RankExpression(
+                order_by=[ColumnReferenceExpression(name="key")],
+                partition_by=[ColumnReferenceExpression(name=name) for name in partition_by],
+                descending=descending
+            ).compile()
+
+        result_df = df.select(
+            rank(False, []).alias("asc"),
+            rank(True, []).alias("desc"),
+            rank(False, ["group"]).alias("asc_by_group"),
+            rank(True, ["group"]).alias("desc_by_group"),
+        )
+        expected_df = pl.DataFrame({
+            "asc": [5, 1, 3, 4, 2],
+            "desc": [1, 4, 3, 2, 5],
+            "asc_by_group": [4, 1, 2, 3, 1],
+            "desc_by_group": [1, 4, 3, 2, 1],
+        }, schema=dict.fromkeys(["asc", "desc", "asc_by_group", "desc_by_group"], pl.UInt32))
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+        # Same ranks as the struct ordering used for several keys
+        struct_df = df.select(
+            pl.struct(pl.col("key")).rank("ordinal").alias("asc"),
+            pl.struct(pl.col("key")).rank("ordinal", descending=True).alias("desc"),
+        )
+        assert_frame_equal(result_df.select("asc", "desc"), struct_df, check_dtypes=True)
+
     def test_string_distance_expression(self):
         """
         Tests AddColumns with StringDistanceExpression for Levenshtein.
@@ -324,8 +522,7 @@ class StepTests(unittest.TestCase):
         }, schema_overrides={"lev_dist": pl.UInt32})
 
         result_df = final_table_space["strings_table"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_hash_expression(self):
         """
@@ -370,8 +567,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["strings_table"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_hash_expression_advanced(self):
         """
@@ -489,6 +685,31 @@ class StepTests(unittest.TestCase):
         self.assertListEqual(sorted(result_df.columns), expected_col_names,
                              msg="Final column list does not match expected.")
 
+    def test_hash_expression_unknown_hash_type(self):
+        """
+        Tests that an unsupported hash type is rejected with a ValueError.
+        """
+        hash_expr = HashExpression(
+            hash_type="crc32",
+            encoding="hex",
+            value=ColumnReferenceExpression(name="text")
+        )
+        with self.assertRaises(ValueError):
+            hash_expr.to_polars()
+
+    def test_substring_expression_rejects_length_and_end(self):
+        """
+        Tests that a SubstringExpression with both 'length' and 'end' is
+        rejected when it is constructed.
+        """
+        with self.assertRaises(ValueError):
+            SubstringExpression(
+                value=ColumnReferenceExpression(name="text"),
+                start=ConstantValueExpression(value=0),
+                length=ConstantValueExpression(value=2),
+                end=ConstantValueExpression(value=3)
+            )
+
     def test_fuzzy_string_filter_expression(self):
         """
         Tests Filter step with a FuzzyStringFilterExpression using Levenshtein distance.
@@ -532,8 +753,6 @@ class StepTests(unittest.TestCase):
 
         self.assertTrue("filtered_names" in final_table_space)
         result_df = final_table_space["filtered_names"].collect()
-        result_df = result_df.sort("id")
-        expected_df = expected_df.sort("id")
 
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
@@ -597,11 +816,56 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["source_data"].collect()
-        # Ensure column order for comparison
-        result_df = result_df.select(expected_df.columns)
-        result_df = result_df.sort("id")
-        expected_df = expected_df.sort("id")
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
+
+    def test_when_then_otherwise_constant_conditions_are_folded(self):
+        """
+        Tests that clauses with constant conditions are resolved up front:
+        a false condition is dropped and a true one ends the chain.
+        """
+        value_gt_100 = GtExpression(
+            lhs=ColumnReferenceExpression(name="value"),
+            rhs=ConstantValueExpression(value=100)
+        )
+        partially_folded = WhenThenOtherwiseExpression(
+            conditions=[
+                WhenThenClause(
+                    when=ConstantValueExpression(value=False),
+                    then=ConstantValueExpression(value="Never")
+                ),
+                WhenThenClause(when=value_gt_100, then=ConstantValueExpression(value="High")),
+                WhenThenClause(
+                    when=ConstantValueExpression(value=True),
+                    then=ConstantValueExpression(value="Low")
+                ),
+                WhenThenClause(
+                    when=ConstantValueExpression(value=True),
+                    then=ConstantValueExpression(value="Unreachable")
+                )
+            ],
+            otherwise=ConstantValueExpression(value="Unreachable")
+        )
+        fully_folded = WhenThenOtherwiseExpression(
+            conditions=[
+                WhenThenClause(
+                    when=ConstantValueExpression(value=None),
+                    then=ConstantValueExpression(value="Never")
+                )
+            ],
+            otherwise=ConstantValueExpression(value="Low")
+        )
+        self.assertEqual(fully_folded.constant_value(), "Low")
 
+        result_df = pl.DataFrame({"value": [200, 30]}).select(
+            pl.col("value"),
+            partially_folded.to_polars().alias("category"),
+            fully_folded.to_polars().alias("fallback"),
+        )
+        expected_df = pl.DataFrame({
+            "value": [200, 30],
+            "category": ["High", "Low"],
+            "fallback": ["Low", "Low"]
+        })
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_add_columns_with_string_replace_expression(self):
@@ -644,11 +908,49 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["source_data"].collect()
-        # Ensure column order for comparison
-        result_df = result_df.select(expected_df.columns)
-        result_df = result_df.sort("id")
-        expected_df = expected_df.sort("id")
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
+
+    def test_string_replace_all_literal_pattern(self):
+        """
+        Tests StringReplaceExpression with plain string pattern and replacement,
+        replace_all=True and literal=True: regex metacharacters match literally.
+        """
+        initial_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "text_col": ["a.b.c", "abc", "..x"]
+        }).lazy()
+        initial_table_space: TableSpace = {"source_data": initial_df}
+
+        replace_step = AddColumns(
+            table="source_data",
+            columns=[
+                ColumnDefinition(
+                    name="replaced",
+                    expression=StringReplaceExpression(
+                        value=ColumnReferenceExpression(name="text_col"),
+                        pattern=".",
+                        replacement="-",
+                        replace_all=True,
+                        literal=True
+                    )
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[replace_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
 
+        expected_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "text_col": ["a.b.c", "abc", "..x"],
+            "replaced": ["a-b-c", "abc", "--x"]
+        })
+
+        result_df = final_table_space["source_data"].collect()
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_add_columns_with_fillna_expression(self):
@@ -706,12 +1008,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["source_data"].collect()
-        # Ensure column order for comparison
-        result_df = result_df.select(expected_df.columns)
-        result_df = result_df.sort("id")
-        expected_df = expected_df.sort("id")
-
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_window_expression_aggregations(self):
         """
@@ -801,10 +1098,9 @@ class StepTests(unittest.TestCase):
             "first_val_by_cat": [10, 10, 10, 100, 100, 100],
         }, schema_overrides={"total_count": pl.UInt32, "min_val_by_cat": pl.Int64, "first_val_by_cat": pl.Int64})
 
+        # with_columns keeps the input order, which is already sorted by category
         result_df = final_table_space["data_table"].collect()
-        # Sort result by the same keys as expected_df if not already guaranteed by processing
-        result_df = result_df.sort(["category", "order_for_first"]) 
-        
+
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_add_columns_unary_minus(self):
@@ -844,8 +1140,45 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["input_table"].collect()
-        # Ensure column order for comparison
-        result_df = result_df.select(expected_df.columns)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
+
+    def test_add_columns_log2(self):
+        """
+        Tests AddColumns step with a Log2Expression.
+        Adds a column 'log2_value' = log2(col("value")).
+        """
+        initial_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "value": [1.0, 8.0, 0.5]
+        }).lazy()
+        initial_table_space: TableSpace = {"input_table": initial_df}
+
+        add_col_step = AddColumns(
+            table="input_table",
+            columns=[
+                ColumnDefinition(
+                    name="log2_value",
+                    expression=Log2Expression(
+                        value=ColumnReferenceExpression(name="value")
+                    )
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[add_col_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "value": [1.0, 8.0, 0.5],
+            "log2_value": [0.0, 3.0, -1.0]
+        })
+
+        result_df = final_table_space["input_table"].collect()
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
     def test_string_contains_expression_literal(self):
@@ -887,8 +1220,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_contains_expression_regex(self):
         """
@@ -928,8 +1260,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_contains_any_expression(self):
         """
@@ -969,8 +1300,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_count_matches_expression(self):
         """
@@ -1020,8 +1350,7 @@ class StepTests(unittest.TestCase):
         }, schema_overrides={"count_ab_literal": pl.UInt32, "count_a_regex": pl.UInt32})
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_extract_expression(self):
         """
@@ -1071,8 +1400,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_starts_with_expression(self):
         """
@@ -1120,8 +1448,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_ends_with_expression(self):
         """
@@ -1169,8 +1496,7 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
-        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
 
     def test_string_contains_any_case_insensitive(self):
         """
@@ -1210,7 +1536,480 @@ class StepTests(unittest.TestCase):
         })
 
         result_df = final_table_space["test_data"].collect()
-        result_df = result_df.select(expected_df.columns)
+        assert_frame_equal(result_df, expected_df, check_dtypes=True, check_column_order=False)
+
+    def test_to_polars_is_cached_for_shared_subtree(self):
+        """
+        Tests that to_polars() is computed once per expression node, and that a
+        subtree referenced several times still evaluates correctly.
+        """
+        shared_sum = PlusExpression(
+            lhs=ColumnReferenceExpression(name="a"),
+            rhs=ColumnReferenceExpression(name="b")
+        )
+        self.assertIs(shared_sum.to_polars(), shared_sum.to_polars())
+
+        initial_df = pl.DataFrame({
+            "a": [1, 5, 10],
+            "b": [2, 5, 1]
+        }).lazy()
+        initial_table_space: TableSpace = {"input_table": initial_df}
+
+        add_col_step = AddColumns(
+            table="input_table",
+            columns=[
+                ColumnDefinition(
+                    name="in_range",
+                    expression=AndExpression(operands=[
+                        GtExpression(lhs=shared_sum, rhs=ConstantValueExpression(value=3)),
+                        GtExpression(lhs=ConstantValueExpression(value=11), rhs=shared_sum),
+                    ])
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[add_col_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "a": [1, 5, 10],
+            "b": [2, 5, 1],
+            "in_range": [False, True, False]
+        })
+
+        result_df = final_table_space["input_table"].collect()
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_leaf_expressions_are_built_once(self):
+        """
+        Tests that constant and column reference nodes reuse their Polars
+        literal / column expression across calls.
+        """
+        threshold = ConstantValueExpression(value=0)
+        column = ColumnReferenceExpression(name="value")
+        self.assertIs(threshold.to_polars(), threshold.to_polars())
+        self.assertIs(column.to_polars(), column.to_polars())
+
+    def test_concrete_expression_decodes_nested_expressions(self):
+        """
+        Tests that a concrete expression class, imported from the package or
+        straight from its submodule, decodes nested expressions of other
+        submodules before anything else touches AnyExpression.
+        Runs in a fresh interpreter, as other tests resolve the union already.
+        """
+        decode = (
+            "import msgspec\n"
+            "{import_line}\n"
+            "decoded = msgspec.json.decode(\n"
+            "    b'{{\"type\": \"gt\", \"lhs\": {{\"type\": \"col\", \"name\": \"a\"}},'\n"
+            "    b' \"rhs\": {{\"type\": \"to_upper\", \"value\": {{\"type\": \"const\", \"value\": \"x\"}}}}}}',\n"
+            "    type=GtExpression)\n"
+            "assert type(decoded.rhs).__name__ == 'ToUpperExpression', decoded\n"
+        )
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for import_line in ("from ptabler.expression import GtExpression",
+                            "from ptabler.expression.basics import GtExpression",
+                            "import ptabler.expression.string\n"
+                            "from ptabler.expression.basics import GtExpression"):
+            with self.subTest(import_line=import_line):
+                result = subprocess.run(
+                    [sys.executable, "-c", decode.format(import_line=import_line)],
+                    cwd=src_dir, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_structurally_equal_expressions_share_polars_expression(self):
+        """
+        Tests that inside planning_context() separately constructed but
+        structurally equal subtrees render to the same Polars expression.
+        """
+        def make_sum():
+            return PlusExpression(
+                lhs=ColumnReferenceExpression(name="x"),
+                rhs=ConstantValueExpression(value=1)
+            )
+
+        with planning_context():
+            first = make_sum().to_polars()
+            second = make_sum().to_polars()
+        self.assertIs(first, second)
+
+        # Outside the cache, distinct nodes are rendered independently
+        self.assertIsNot(make_sum().to_polars(), make_sum().to_polars())
+
+        compiled = AndExpression(operands=[
+            GtExpression(lhs=make_sum(), rhs=ConstantValueExpression(value=2)),
+            GtExpression(lhs=ConstantValueExpression(value=5), rhs=make_sum()),
+        ]).compile()
+        result_df = pl.DataFrame({"x": [1, 2, 4]}).select(compiled.alias("in_range"))
+        expected_df = pl.DataFrame({"in_range": [False, True, False]})
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_structural_key_of_deep_tree(self):
+        """
+        Tests that structural keys are composed from child keys, so deep trees
+        can be keyed and differ exactly when some node differs.
+        """
+        def make_chain(depth, last):
+            expression = ColumnReferenceExpression(name="x")
+            for i in range(depth):
+                value = last if i == depth - 1 else 1
+                expression = PlusExpression(lhs=expression, rhs=ConstantValueExpression(value=value))
+            return expression
+
+        depth = 5 * sys.getrecursionlimit()
+        first = make_chain(depth, 1)
+        self.assertEqual(first.structural_key(), make_chain(depth, 1).structural_key())
+        self.assertNotEqual(first.structural_key(), make_chain(depth, 2).structural_key())
+        self.assertNotEqual(first.structural_key(), make_chain(depth, "1").structural_key())
+        self.assertNotEqual(first.structural_key(), first.lhs.structural_key())
+
+    def test_deeply_nested_expression_is_lowered(self):
+        """
+        Tests that lowering does not recurse per level, so trees deeper than
+        the interpreter recursion limit can be rendered.
+        """
+        depth = 2 * sys.getrecursionlimit()
+        expression = ColumnReferenceExpression(name="x")
+        for _ in range(depth):
+            expression = PlusExpression(lhs=expression, rhs=ConstantValueExpression(value=1))
+
+        self.assertIsInstance(expression.compile(), pl.Expr)
+        # Also outside a planning context
+        self.assertIsInstance(expression.to_polars(), pl.Expr)
+
+    def test_string_join_with_adjacent_constants(self):
+        """
+        Tests that adjacent string constants in StringJoinExpression are joined
+        with the delimiter just like any other operands.
+        """
+        join_expr = StringJoinExpression(
+            operands=[
+                ColumnReferenceExpression(name="name"),
+                ConstantValueExpression(value="x"),
+                ConstantValueExpression(value="y"),
+                ColumnReferenceExpression(name="id"),
+            ],
+            delimiter="_"
+        )
+        result_df = pl.DataFrame({
+            "name": ["a", "b"],
+            "id": [1, 2]
+        }).select(join_expr.to_polars().alias("joined"))
+        expected_df = pl.DataFrame({"joined": ["a_x_y_1", "b_x_y_2"]})
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_constant_string_expressions_are_folded(self):
+        """
+        Tests that string expressions over constants are evaluated up front
+        and give the same result as their Polars counterparts.
+        """
+        join_expr = StringJoinExpression(
+            operands=[ConstantValueExpression(value="a"), ConstantValueExpression(value="b")],
+            delimiter="-"
+        )
+        substring_expr = SubstringExpression(
+            value=ConstantValueExpression(value="abcdef"),
+            start=ConstantValueExpression(value=1),
+            end=ConstantValueExpression(value=4)
+        )
+        replace_expr = StringReplaceExpression(
+            value=ConstantValueExpression(value="a.b.c"),
+            pattern=".",
+            replacement="$",
+            replace_all=True,
+            literal=True
+        )
+        null_join_expr = StringJoinExpression(
+            operands=[ConstantValueExpression(value="a"), ConstantValueExpression(value=None)]
+        )
+        self.assertEqual(join_expr.constant_value(), "a-b")
+        self.assertEqual(substring_expr.constant_value(), "bcd")
+        self.assertEqual(replace_expr.constant_value(), "a$b$c")
+        self.assertIsNone(null_join_expr.constant_value())
+
+        result_df = pl.DataFrame({"id": [1, 2]}).select(
+            pl.col("id"),
+            join_expr.to_polars().alias("joined"),
+            substring_expr.to_polars().alias("substring"),
+            replace_expr.to_polars().alias("replaced"),
+            null_join_expr.to_polars().alias("null_joined"),
+        )
+        expected_df = pl.DataFrame({
+            "id": [1, 2],
+            "joined": ["a-b", "a-b"],
+            "substring": ["bcd", "bcd"],
+            "replaced": ["a$b$c", "a$b$c"],
+            "null_joined": [None, None],
+        }, schema={"id": pl.Int64, "joined": pl.String, "substring": pl.String,
+                   "replaced": pl.String, "null_joined": pl.String})
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_constant_operator_expressions_are_folded(self):
+        """
+        Tests that arithmetic, comparisons and case conversions of constants
+        are evaluated up front and match the unfolded Polars result, while
+        operations whose Python and Polars semantics differ are left to Polars.
+        """
+        sum_expr = PlusExpression(
+            lhs=ConstantValueExpression(value=5), rhs=ConstantValueExpression(value=3))
+        gt_expr = GtExpression(
+            lhs=ConstantValueExpression(value="b"), rhs=ConstantValueExpression(value="a"))
+        upper_expr = ToUpperExpression(value=ConstantValueExpression(value="ab"))
+        div_by_zero_expr = TrueDivExpression(
+            lhs=ConstantValueExpression(value=1), rhs=ConstantValueExpression(value=0))
+        self.assertEqual(sum_expr.constant_value(), 8)
+        self.assertIs(gt_expr.constant_value(), True)
+        self.assertEqual(upper_expr.constant_value(), "AB")
+        self.assertIs(div_by_zero_expr.constant_value(), NOT_CONSTANT)
+
+        initial_df = pl.DataFrame({"id": [1, 2]})
+        result_df = initial_df.select(
+            pl.col("id"),
+            sum_expr.to_polars().alias("sum"),
+            gt_expr.to_polars().alias("gt"),
+            upper_expr.to_polars().alias("upper"),
+            div_by_zero_expr.to_polars().alias("div_by_zero"),
+        )
+        expected_df = initial_df.select(
+            pl.col("id"),
+            (pl.lit(5) + pl.lit(3)).alias("sum"),
+            (pl.lit("b") > pl.lit("a")).alias("gt"),
+            pl.lit("ab").str.to_uppercase().alias("upper"),
+            (pl.lit(1) / pl.lit(0)).alias("div_by_zero"),
+        )
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_constant_value_is_computed_once_per_node(self):
+        """
+        Tests that folding a chain of operators evaluates each node once,
+        although every node asks its operands for their constant value.
+        """
+        depth = 50
+        expr = ConstantValueExpression(value=0)
+        for _ in range(depth):
+            expr = PlusExpression(lhs=expr, rhs=ConstantValueExpression(value=1))
+
+        with mock.patch.object(
+                BinaryOperatorExpression, "_constant_value_impl", autospec=True,
+                side_effect=BinaryOperatorExpression._constant_value_impl) as impl:
+            with planning_context():
+                expr.to_polars()
+            self.assertEqual(expr.constant_value(), depth)
+        self.assertEqual(impl.call_count, depth)
+
+    def test_string_join_ignore_nulls(self):
+        """
+        Tests that StringJoinExpression with ignore_nulls=True skips null
+        operands instead of returning null.
+        """
+        initial_df = pl.DataFrame({
+            "first": ["a", None, "c"],
+            "second": ["x", "y", None]
+        })
+        result_df = initial_df.select(
+            StringJoinExpression(
+                operands=[ColumnReferenceExpression(name="first"),
+                          ColumnReferenceExpression(name="second")],
+                delimiter="-",
+                ignore_nulls=True
+            ).to_polars().alias("ignoring"),
+            StringJoinExpression(
+                operands=[ColumnReferenceExpression(name="first"),
+                          ColumnReferenceExpression(name="second")],
+                delimiter="-"
+            ).to_polars().alias("propagating"),
+        )
+        expected_df = pl.DataFrame({
+            "ignoring": ["a-x", "y", "c"],
+            "propagating": ["a-x", None, None]
+        })
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_string_join_ignore_nulls_single_list_operand(self):
+        """
+        Tests that ignore_nulls also applies to the elements of a single
+        list-typed operand.
+        """
+        initial_df = pl.DataFrame({"tags": [["a", None, "b"], ["c"]]})
+
+        def join(ignore_nulls):
+            return StringJoinExpression(
+                operands=[ColumnReferenceExpression(name="tags")],
+                delimiter="-",
+                ignore_nulls=ignore_nulls
+            )
+
+        with planning_context(initial_df.lazy()):
+            result_df = initial_df.select(
+                join(True).to_polars().alias("ignoring"),
+                join(None).to_polars().alias("propagating"),
+            )
+        expected_df = pl.DataFrame({
+            "ignoring": ["a-b", "c"],
+            "propagating": [None, "c"]
+        })
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_string_join_single_list_operand_nulls(self):
+        """
+        Tests that the elements of a single list operand handle nulls like
+        separate operands passed to concat_str, and that a null list is null.
+        """
+        initial_df = pl.DataFrame({
+            "tags": [["a", None], [None], [], None],
+            "first": ["a", None, None, None],
+            "second": [None, None, None, None],
+        }, schema_overrides={"first": pl.String, "second": pl.String})
+
+        def join(operands, ignore_nulls):
+            return StringJoinExpression(
+                operands=[ColumnReferenceExpression(name=name) for name in operands],
+                delimiter="-",
+                ignore_nulls=ignore_nulls
+            )
+
+        with planning_context(initial_df.lazy()):
+            result_df = initial_df.select(
+                join(["tags"], True).to_polars().alias("list_ignoring"),
+                join(["tags"], False).to_polars().alias("list_propagating"),
+                join(["first", "second"], True).to_polars().alias("columns_ignoring"),
+                join(["first", "second"], False).to_polars().alias("columns_propagating"),
+            )
+        expected_df = pl.DataFrame({
+            "list_ignoring": ["a", "", "", None],
+            "list_propagating": [None, None, "", None],
+            "columns_ignoring": ["a", "", "", ""],
+            "columns_propagating": [None, None, None, None],
+        }, schema=dict.fromkeys(
+            ["list_ignoring", "list_propagating", "columns_ignoring", "columns_propagating"],
+            pl.String))
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_not_expression_simplifications(self):
+        """
+        Tests that double negation and negated null checks evaluate correctly.
+        """
+        initial_df = pl.DataFrame({
+            "flag": [True, False, None],
+            "value": [1, None, 3]
+        })
+        result_df = initial_df.select(
+            NotExpression(value=NotExpression(
+                value=ColumnReferenceExpression(name="flag"))).to_polars().alias("not_not_flag"),
+            NotExpression(value=IsNaExpression(
+                value=ColumnReferenceExpression(name="value"))).to_polars().alias("has_value"),
+            IsNaExpression(value=ConstantValueExpression(value=None)).to_polars().alias("const_is_na"),
+        )
+        expected_df = pl.DataFrame({
+            "not_not_flag": [True, False, None],
+            "has_value": [True, False, True],
+            "const_is_na": [True, True, True]
+        })
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_struct_field_expression_with_known_schema(self):
+        """
+        Tests StructFieldExpression inside AddColumns, where the struct schema is
+        known: existing fields, null structs with a default, and a field that is
+        absent from the schema.
+        """
+        initial_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "info": [{"score": 10, "tag": "x"}, None, {"score": None, "tag": "z"}]
+        }).lazy()
+        initial_table_space: TableSpace = {"input_table": initial_df}
+
+        add_col_step = AddColumns(
+            table="input_table",
+            columns=[
+                ColumnDefinition(
+                    name="score",
+                    expression=StructFieldExpression(
+                        struct=ColumnReferenceExpression(name="info"),
+                        fields="score",
+                        dtype="Float64",
+                        default=0
+                    )
+                ),
+                ColumnDefinition(
+                    name="tag",
+                    expression=StructFieldExpression(
+                        struct=ColumnReferenceExpression(name="info"),
+                        fields=["tag"]
+                    )
+                ),
+                ColumnDefinition(
+                    name="missing",
+                    expression=StructFieldExpression(
+                        struct=ColumnReferenceExpression(name="info"),
+                        fields="missing",
+                        dtype="String",
+                        default="n/a"
+                    )
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[add_col_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "info": [{"score": 10, "tag": "x"}, None, {"score": None, "tag": "z"}],
+            "score": [10.0, 0.0, 0.0],
+            "tag": ["x", None, "z"],
+            "missing": ["n/a", "n/a", "n/a"]
+        })
+
+        result_df = final_table_space["input_table"].collect()
+        assert_frame_equal(result_df, expected_df, check_dtypes=True)
+
+    def test_string_join_single_list_operand(self):
+        """
+        Tests that StringJoinExpression with a single list-typed operand joins
+        the list elements with the delimiter.
+        """
+        initial_df = pl.DataFrame({
+            "id": [1, 2],
+            "tags": [["a", "b", "c"], ["d"]]
+        }).lazy()
+        initial_table_space: TableSpace = {"input_table": initial_df}
+
+        add_col_step = AddColumns(
+            table="input_table",
+            columns=[
+                ColumnDefinition(
+                    name="joined_tags",
+                    expression=StringJoinExpression(
+                        operands=[ColumnReferenceExpression(name="tags")],
+                        delimiter=","
+                    )
+                )
+            ]
+        )
+
+        workflow = PWorkflow(workflow=[add_col_step])
+        final_table_space, _ = workflow.execute(
+            global_settings=global_settings,
+            lazy=True,
+            initial_table_space=initial_table_space
+        )
+
+        expected_df = pl.DataFrame({
+            "id": [1, 2],
+            "tags": [["a", "b", "c"], ["d"]],
+            "joined_tags": ["a,b,c", "d"]
+        })
+
+        result_df = final_table_space["input_table"].collect()
         assert_frame_equal(result_df, expected_df, check_dtypes=True)
 
 
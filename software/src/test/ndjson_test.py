@@ -1,5 +1,7 @@
 import unittest
 import os
+from pathlib import Path
+import polars as pl
 from ptabler.workflow import PWorkflow
 from ptabler.steps import GlobalSettings, ReadCsv, ReadNdjson, WriteCsv, WriteNdjson, AddColumns
 from ptabler.steps.basics import ColumnDefinition
@@ -10,6 +12,8 @@ test_data_root_dir = os.path.join(
     os.path.dirname(os.path.dirname(current_script_dir)),
     "test_data")
 global_settings = GlobalSettings(root_folder=test_data_root_dir)
+OUTPUTS_DIR = Path(test_data_root_dir) / "outputs"
+OUTPUTS_DIR.mkdir(exist_ok=True)
 
 class NdjsonTest(unittest.TestCase):
 
@@ -18,7 +22,7 @@ class NdjsonTest(unittest.TestCase):
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_ndjson_to_csv.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -33,24 +37,22 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_workflow_read_csv_write_ndjson(self):
         """Test reading CSV file and writing to NDJSON"""
         input_file_relative_path = "test_data_1.tsv"
         output_file_relative_path = "output_csv_to_ndjson.ndjson"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadCsv(
             file=input_file_relative_path,
@@ -66,24 +68,22 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_ndjson_n_rows_functionality(self):
         """Test nRows parameter limits the number of rows read from NDJSON"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_ndjson_limited_rows.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -99,31 +99,26 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
             
-            # Read the output file and verify it has exactly 3 data rows (plus header)
-            with open(output_file_abs_path, 'r') as f:
-                lines = f.readlines()
-                # Should have header + 3 data rows = 4 total lines
-                self.assertEqual(len(lines), 4, 
-                               f"Expected 4 lines (header + 3 data rows), got {len(lines)}")
+            # Read the output file and verify it has exactly 3 data rows
+            row_count = pl.scan_csv(output_file_abs_path).select(pl.len()).collect().item()
+            self.assertEqual(row_count, 3, f"Expected 3 data rows, got {row_count}")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_csv_n_rows_functionality(self):
         """Test nRows parameter limits the number of rows read from CSV"""
         input_file_relative_path = "test_data_1.tsv"
         output_file_relative_path = "output_csv_limited_rows.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadCsv(
             file=input_file_relative_path,
@@ -139,31 +134,26 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
             
-            # Read the output file and verify it has exactly 2 data rows (plus header)  
-            with open(output_file_abs_path, 'r') as f:
-                lines = f.readlines()
-                # Should have header + 2 data rows = 3 total lines
-                self.assertEqual(len(lines), 3, 
-                               f"Expected 3 lines (header + 2 data rows), got {len(lines)}")
+            # Read the output file and verify it has exactly 2 data rows
+            row_count = pl.scan_csv(output_file_abs_path).select(pl.len()).collect().item()
+            self.assertEqual(row_count, 2, f"Expected 2 data rows, got {row_count}")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_ndjson_roundtrip(self):
         """Test reading NDJSON, writing NDJSON - roundtrip test"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_ndjson_roundtrip.ndjson"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -177,29 +167,26 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
             
             # Verify the output file has content
-            with open(output_file_abs_path, 'r') as f:
-                lines = f.readlines()
-                self.assertGreater(len(lines), 0, "Output file should not be empty")
+            row_count = pl.scan_ndjson(output_file_abs_path).select(pl.len()).collect().item()
+            self.assertGreater(row_count, 0, "Output file should not be empty")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_single_extraction(self):
         """Test extracting single fields from nested structures"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_single_field.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -242,12 +229,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -259,15 +245,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("New York", content, "Should extract city field")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_individual_extraction(self):
         """Test extracting individual fields from the same nested structure"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_individual_fields.ndjson"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -303,12 +288,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -321,15 +305,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("New York", content, "Should extract city values")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_nested_access(self):
         """Test accessing deeply nested fields"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_nested_access.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -371,12 +354,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -387,15 +369,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("-74.006", content, "Should extract longitude")  # Note: CSV may truncate precision
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_missing_fields(self):
         """Test behavior when struct fields are missing in some records"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_missing_fields.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -431,12 +412,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file handles missing fields gracefully
@@ -447,15 +427,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertEqual(len(lines), 9, "Should have 8 data rows + header")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_missing_entire_struct(self):
         """Test behavior when entire struct object is missing"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_missing_object.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -484,12 +463,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Should handle missing entire struct gracefully
@@ -498,15 +476,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertEqual(len(lines), 9, "Should process all records including those with missing structs")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_coordinates_with_missing_data(self):
         """Test extracting coordinates struct when it's missing in some records"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_coordinates_missing.ndjson"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -535,12 +512,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file handles missing struct fields gracefully
@@ -551,15 +527,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertEqual(len(lines), 8, "Should have 8 data rows")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_deeply_nested_nonexistent_fields(self):
         """Test behavior when trying to access deeply nested fields from non-existent root fields"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_deeply_nested_nonexistent.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -604,12 +579,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file handles deeply nested non-existent fields gracefully
@@ -625,15 +599,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("mixed_existing_nonexistent", header, "Should have mixed_existing_nonexistent column")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_recursive_array_access(self):
         """Test recursive field access using arrays instead of nested StructFieldExpression calls"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_recursive_array.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -669,12 +642,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -685,15 +657,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("-74.006", content, "Should extract longitude using array access")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_default_values(self):
         """Test default values when fields are missing"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_defaults.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -748,12 +719,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -766,15 +736,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("false", content, "Should use boolean default for missing field")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_recursive_array_with_defaults(self):
         """Test recursive array access with default values for deeply nested missing fields"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_recursive_defaults.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -812,12 +781,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -828,15 +796,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("not_found", content, "Should use string default for completely missing nested path")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_dtype_casting(self):
         """Test dtype casting for extracted fields"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_dtype_casting.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -882,12 +849,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -898,15 +864,14 @@ class NdjsonTest(unittest.TestCase):
                 self.assertEqual(len(lines), 9, "Should have 8 data rows + header")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
     def test_struct_field_combined_features(self):
         """Test combining recursive array access, default values, and dtype casting"""
         input_file_relative_path = "test_data_1.ndjson"
         output_file_relative_path = "output_struct_combined_features.csv"
 
-        output_file_abs_path = os.path.join(test_data_root_dir, "outputs", output_file_relative_path)
+        output_file_abs_path = OUTPUTS_DIR / output_file_relative_path
 
         read_step = ReadNdjson(
             file=input_file_relative_path,
@@ -946,12 +911,11 @@ class NdjsonTest(unittest.TestCase):
 
         ptw = PWorkflow(workflow=[read_step, add_columns_step, write_step])
 
-        if os.path.exists(output_file_abs_path):
-            os.remove(output_file_abs_path)
+        output_file_abs_path.unlink(missing_ok=True)
 
         try:
             ptw.execute(global_settings=global_settings)
-            self.assertTrue(os.path.exists(output_file_abs_path),
+            self.assertTrue(output_file_abs_path.is_file(),
                             f"Output file was not created at {output_file_abs_path}")
 
             # Read and verify the output file
@@ -962,8 +926,7 @@ class NdjsonTest(unittest.TestCase):
                 self.assertIn("No description available", content, "Should use string default with string casting")
 
         finally:
-            if os.path.exists(output_file_abs_path):
-                os.remove(output_file_abs_path)
+            output_file_abs_path.unlink(missing_ok=True)
 
 
 if __name__ == '__main__':